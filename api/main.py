@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from api.v1.routes import (
     version,
     users,
@@ -11,7 +11,9 @@ from api.v1.routes import (
     item_variants,
 )
 
-router = APIRouter(prefix="/api/v1", tags=["API v1"])
+router = APIRouter(prefix="/api/v1",
+                   tags=["API v1"],
+                   default_response_class=ORJSONResponse)
 router.include_router(login.router)
 router.include_router(version.router)
 router.include_router(users.router)
@@ -26,4 +28,4 @@ router.include_router(upload.router)
             summary="API v1 root endpoint",
             description="Returns a welcome message for the API v1")
 async def root():
-    return JSONResponse(content={"message": "Welcome to API version 1"})
+    return ORJSONResponse(content={"message": "Welcome to API version 1"})
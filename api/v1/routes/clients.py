@@ -1,18 +1,28 @@
 from uuid import UUID
 from typing import List
-from fastapi import APIRouter, HTTPException, Query, status, Response, Depends
+from operator import attrgetter
+from fastapi import APIRouter, status, Depends
 
 # --- Project Imports ---
-from core.query_utils import parse_params, calculate_pagination, set_pagination_headers
+from models.common import ListQueryParams
+from core.query_utils import list_params, calculate_pagination, set_pagination_headers
 from core.logger import logger
 from core.dependencies import CurrentUser
 from core.database import SessionDep
-from core.exceptions import InternalErrorException, NotFoundException
+from core.responses import stream_json_array
+from core.exceptions import NotFoundException
 from services.client_service import ClientService
 from models.client import Client, ClientCreate, ClientUpdate, ClientPublic, ClientFilters
 
 router = APIRouter(prefix="/clients", tags=["Clients"])
 
+# Fields copied from the Client row into ClientPublic
+CLIENT_PUBLIC_FIELDS = tuple(field for field in ClientPublic.model_fields
+                             if field != "order_ids")
+# Resolved once at import so to_public does no per-call lookups
+get_client_public_values = attrgetter(*CLIENT_PUBLIC_FIELDS)
+construct_client_public = ClientPublic.model_construct
+
 # ---------- Helper Functions ----------
 
 
@@ -32,11 +42,15 @@ def get_client_or_404(
     return client
 
 
-def to_public(client: Client) -> ClientPublic:
+def to_public(client: Client, order_ids: List[int]) -> ClientPublic:
     """Convert Client to ClientPublic with order IDs"""
-    order_ids = [order.id for order in client.orders] if client.orders else []
-    return ClientPublic(**client.model_dump(), order_ids=order_ids)
+    # Values come from a validated database row, so skip re-validation
+    data = dict(zip(CLIENT_PUBLIC_FIELDS, get_client_public_values(client)))
+    return construct_client_public(**data, order_ids=order_ids)
+
 
+# Filter, range and sort query parameters of the list endpoint
+get_client_list_params = list_params(ClientFilters, '["id", "ASC"]')
 
 # ---------- Routes ----------
 
@@ -45,17 +59,13 @@ def to_public(client: Client) -> ClientPublic:
             response_model=List[ClientPublic],
             summary="List clients",
             description="Retrieve a paginated list of clients with filtering")
-def list_clients(response: Response,
-                 current_user: CurrentUser,
+def list_clients(current_user: CurrentUser,
                  service: ClientService = Depends(get_client_service),
-                 filter_: str = Query("{}", alias="filter"),
-                 range_: str = Query("[0, 500]", alias="range"),
-                 sort: str = Query('["id", "ASC"]', alias="sort")):
+                 params: ListQueryParams = Depends(get_client_list_params)):
 
     logger.debug(f"User {current_user.username} listing clients")
 
-    params = parse_params(filter_, range_, sort)
-    filters = ClientFilters(**params.filters)
+    filters = params.filters
     offset, limit = calculate_pagination(params.range_list)
 
     clients, total = service.get_clients(filters=filters,
@@ -64,18 +74,20 @@ def list_clients(response: Response,
                                          sort_field=params.sort_field,
                                          sort_order=params.sort_order)
 
-    result = [to_public(client) for client in clients]
+    order_ids = service.get_order_ids([client.id for client in clients])
+    result = (to_public(client, order_ids[client.id]) for client in clients)
+    response = stream_json_array(result)
 
     set_pagination_headers(response=response,
-                           count=len(result),
+                           count=len(clients),
                            total=total,
                            offset=offset,
                            resource_name="clients")
     logger.info(
-        f"User {current_user.username} retrieved {len(result)}/{total} clients"
+        f"User {current_user.username} retrieved {len(clients)}/{total} clients"
     )
 
-    return result
+    return response
 
 
 @router.post("",
@@ -91,7 +103,8 @@ def create_client(client_in: ClientCreate,
     client = service.create(client_in)
 
     logger.info(f"User {current_user.username} created client {client.id}")
-    return to_public(client)
+    # A newly created client can't have orders yet
+    return to_public(client, [])
 
 
 @router.get("/{client_id}",
@@ -99,10 +112,12 @@ def create_client(client_in: ClientCreate,
             summary="Get client by ID",
             description="Retrieve a single client by their UUID")
 def read_client(current_user: CurrentUser,
-                client: Client = Depends(get_client_or_404)):
+                client: Client = Depends(get_client_or_404),
+                service: ClientService = Depends(get_client_service)):
     """Retrieve a specific client by ID."""
+    order_ids = service.get_order_ids([client.id])
     logger.info(f"User {current_user.username} retrieved client {client.id}")
-    return to_public(client)
+    return to_public(client, order_ids[client.id])
 
 
 @router.put("/{client_id}",
@@ -116,8 +131,9 @@ def update_client(current_user: CurrentUser,
     logger.info(f"User {current_user.username} updating client {client.id}")
 
     updated_client = service.update(client, client_in)
+    order_ids = service.get_order_ids([client.id])
     logger.info(f"User {current_user.username} updated client {client.id}")
-    return to_public(updated_client)
+    return to_public(updated_client, order_ids[client.id])
 
 
 @router.delete("/{client_id}",
@@ -1,16 +1,18 @@
 from uuid import UUID
 from typing import List
-from fastapi import APIRouter, Query, Response, Depends
+from fastapi import APIRouter, Response, Depends
 
 # --- Project Imports ---
 from core.logger import logger
 from core.dependencies import CurrentUser
 from core.database import SessionDep
-from core.exceptions import NotFoundException
+from core.exceptions import NotFoundException, BadRequestException
 from services.item_variant_service import ItemVariantService
-from core.query_utils import parse_params, calculate_pagination, set_pagination_headers
+from models.common import ListQueryParams
+from core.query_utils import list_params, calculate_pagination, set_pagination_headers
 from models.item_variant import (
     ItemVariant,
+    ItemVariantPriceBase,
     ItemVariantPublic,
     ItemVariantFilters,
     ItemVariantUpdate,
@@ -38,6 +40,26 @@ def get_variant_or_404(
     return variant
 
 
+def require_variant_changes(
+        variant_in: ItemVariantUpdate) -> ItemVariantUpdate:
+    """Dependency rejecting an empty update before the variant is loaded"""
+    if not variant_in.model_fields_set:
+        logger.warning("No data provided for update")
+        raise BadRequestException("No data provided for update")
+    return variant_in
+
+
+def to_public(variant: ItemVariant) -> ItemVariantPublic:
+    """Convert ItemVariant to ItemVariantPublic"""
+    prices = [
+        ItemVariantPriceBase.from_orm_fast(price) for price in variant.prices
+    ]
+    return ItemVariantPublic.from_orm_fast(variant, prices=prices)
+
+
+# Filter, range and sort query parameters of the list endpoint
+get_variant_list_params = list_params(ItemVariantFilters, '["id","ASC"]')
+
 # ---------- Routes ----------
 
 
@@ -48,14 +70,10 @@ def get_variant_or_404(
 def list_variants(response: Response,
                   current_user: CurrentUser,
                   service: ItemVariantService = Depends(get_variant_service),
-                  filter_: str = Query("{}", alias="filter"),
-                  range_: str = Query("[0, 500]", alias="range"),
-                  sort: str = Query('["id","ASC"]', alias="sort")):
+                  params: ListQueryParams = Depends(get_variant_list_params)):
     logger.debug(f"User {current_user.username} listing variants")
 
-    # Parse query parameters
-    params = parse_params(filter_, range_, sort)
-    filters = ItemVariantFilters(**params.filters)
+    filters = params.filters
     offset, limit = calculate_pagination(params.range_list)
 
     # Fetch variants
@@ -75,7 +93,7 @@ def list_variants(response: Response,
     logger.info(
         f"User {current_user.username} retrieved {len(variants)}/{total} variants"
     )
-    return variants
+    return [to_public(variant) for variant in variants]
 
 
 @router.get("/{variant_id}",
@@ -85,7 +103,7 @@ def list_variants(response: Response,
 def get_variant(current_user: CurrentUser,
                 variant: ItemVariant = Depends(get_variant_or_404)):
     logger.info(f"User {current_user.username} retrieved variant {variant.id}")
-    return variant
+    return to_public(variant)
 
 
 @router.put("/{variant_id}",
@@ -93,7 +111,8 @@ def get_variant(current_user: CurrentUser,
             summary="Update item variant",
             description="Update an existing variant by ID")
 def update_variant(current_user: CurrentUser,
-                   variant_in: ItemVariantUpdate,
+                   variant_in: ItemVariantUpdate = Depends(
+                       require_variant_changes),
                    variant: ItemVariant = Depends(get_variant_or_404),
                    service: ItemVariantService = Depends(get_variant_service)):
     logger.info(f"User {current_user.username} updating variant {variant.id}")
@@ -101,4 +120,4 @@ def update_variant(current_user: CurrentUser,
     updated_variant = service.update(variant, variant_in)
 
     logger.info(f"User {current_user.username} updated variant {variant.id}")
-    return updated_variant
+    return to_public(updated_variant)
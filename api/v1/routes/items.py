@@ -1,20 +1,37 @@
 from uuid import UUID
 from datetime import date
 from typing import List, Optional
-from fastapi import APIRouter, Query, status, Response, Depends
+from operator import attrgetter
+from fastapi import APIRouter, Query, Header, status, Depends
+from fastapi.responses import ORJSONResponse
 
 # --- Project Imports ---
 from core.logger import logger
 from core.database import SessionDep
 from core.dependencies import CurrentUser
 from core.exceptions import NotFoundException
-from core.query_utils import parse_params, calculate_pagination, set_pagination_headers
+from models.common import ListQueryParams
+from core.query_utils import list_params, calculate_pagination, set_pagination_headers
+from core.responses import (stream_json_array, stream_ndjson,
+                            cached_json_response)
 from services.item_service import ItemService
-from models.item_variant import ItemVariantPublicInternal, ItemVariant
+from models.item_variant import (ItemVariant, ItemVariantPriceBase,
+                                 ItemVariantPublicInternal)
 from models.item import Item, ItemFilters, ItemPublic, ItemCreate, ItemUpdate
 
 router = APIRouter(prefix="/items", tags=["Items"])
 
+# Fields copied from the rows into ItemPublic-shaped dicts
+ITEM_PUBLIC_FIELDS = tuple(field for field in ItemPublic.model_fields
+                           if field not in ("variants", "order_ids"))
+VARIANT_PUBLIC_FIELDS = tuple(
+    field for field in ItemVariantPublicInternal.model_fields
+    if field != "prices")
+PRICE_PUBLIC_FIELDS = tuple(ItemVariantPriceBase.model_fields)
+get_item_values = attrgetter(*ITEM_PUBLIC_FIELDS)
+get_variant_values = attrgetter(*VARIANT_PUBLIC_FIELDS)
+get_price_values = attrgetter(*PRICE_PUBLIC_FIELDS)
+
 # ---------- Helper Functions ----------
 
 
@@ -33,70 +50,95 @@ def get_item_or_404(
     return item
 
 
-def to_public(item: Item) -> ItemPublic:
-    """Convert Item to ItemPublic with variant and order information"""
-    order_ids = set()
-    public_variants = []
-
+def to_public(item: Item, order_ids: List[int]) -> dict:
+    """Convert Item to a plain ItemPublic-shaped dict"""
+    variants = []
     for variant in item.variants:
-        if not variant.is_archived:
-            public_variants.append(
-                ItemVariantPublicInternal.model_validate(variant))
-        for link in variant.order_links:
-            order_ids.add(link.order_id)
-    return ItemPublic.model_validate(item,
-                                     update={
-                                         "order_ids": list(order_ids),
-                                         "variants": public_variants
-                                     })
-
+        if variant.is_archived:
+            continue
+        data = dict(zip(VARIANT_PUBLIC_FIELDS, get_variant_values(variant)))
+        data["prices"] = [
+            dict(zip(PRICE_PUBLIC_FIELDS, get_price_values(price)))
+            for price in variant.prices
+        ]
+        variants.append(data)
+
+    data = dict(zip(ITEM_PUBLIC_FIELDS, get_item_values(item)))
+    data["variants"] = variants
+    data["order_ids"] = order_ids
+    return data
+
+
+def to_public_response(
+        item: Item,
+        order_ids: List[int],
+        status_code: int = status.HTTP_200_OK) -> ORJSONResponse:
+    """
+    Encode a single item directly. The dict is built from trusted rows, so
+    returning a response skips FastAPI's response_model re-validation.
+    """
+    return ORJSONResponse(to_public(item, order_ids), status_code=status_code)
+
+
+# Filter, range and sort query parameters of the list endpoint
+get_item_list_params = list_params(ItemFilters, '["id","DESC"]')
 
 # ---------- Dropdown Endpoints ----------
 @router.get("/categories",
             response_model=List[str],
             summary="Get category options")
 def get_categories(current_user: CurrentUser,
-                   service: ItemService = Depends(get_item_service)):
+                   service: ItemService = Depends(get_item_service),
+                   if_none_match: Optional[str] = Header(None)):
     """Get distinct category values for dropdown"""
     logger.debug(f"User {current_user.username} fetching category options")
-    return service.get_distinct_field_values(Item, "category")
+    values = service.get_distinct_field_values(Item, "category")
+    return cached_json_response(values, if_none_match)
 
 
 @router.get("/statuses",
             response_model=List[str],
             summary="Get status options")
 def get_statuses(current_user: CurrentUser,
-                 service: ItemService = Depends(get_item_service)):
+                 service: ItemService = Depends(get_item_service),
+                 if_none_match: Optional[str] = Header(None)):
     """Get distinct status values for dropdown"""
     logger.debug(f"User {current_user.username} fetching status options")
-    return service.get_distinct_field_values(Item, "status")
+    values = service.get_distinct_field_values(Item, "status")
+    return cached_json_response(values, if_none_match)
 
 
 @router.get("/sizes", response_model=List[str], summary="Get size options")
 def get_sizes(current_user: CurrentUser,
-              service: ItemService = Depends(get_item_service)):
+              service: ItemService = Depends(get_item_service),
+              if_none_match: Optional[str] = Header(None)):
     """Get distinct size values for dropdown"""
     logger.debug(f"User {current_user.username} fetching size options")
-    return service.get_distinct_field_values(ItemVariant, "size")
+    values = service.get_distinct_field_values(ItemVariant, "size")
+    return cached_json_response(values, if_none_match)
 
 
 @router.get("/colors", response_model=List[str], summary="Get color options")
 def get_colors(current_user: CurrentUser,
-               service: ItemService = Depends(get_item_service)):
+               service: ItemService = Depends(get_item_service),
+               if_none_match: Optional[str] = Header(None)):
     """Get distinct color values for dropdown"""
     logger.debug(f"User {current_user.username} fetching color options")
-    return service.get_distinct_field_values(ItemVariant, "color")
+    values = service.get_distinct_field_values(ItemVariant, "color")
+    return cached_json_response(values, if_none_match)
 
 
 @router.get("/variant-statuses",
             response_model=List[str],
             summary="Get variant status options")
 def get_variant_statuses(current_user: CurrentUser,
-                         service: ItemService = Depends(get_item_service)):
+                         service: ItemService = Depends(get_item_service),
+                         if_none_match: Optional[str] = Header(None)):
     """Get distinct variant status values for dropdown"""
     logger.debug(
         f"User {current_user.username} fetching variant status options")
-    return service.get_distinct_field_values(ItemVariant, "status")
+    values = service.get_distinct_field_values(ItemVariant, "status")
+    return cached_json_response(values, if_none_match)
 
 
 # ---------- CRUD Endpoints ----------
@@ -106,40 +148,61 @@ def get_variant_statuses(current_user: CurrentUser,
             response_model=List[ItemPublic],
             summary="List items with pagination",
             description="Retrieve a paginated list of items")
-def list_items(response: Response,
-               current_user: CurrentUser,
+def list_items(current_user: CurrentUser,
                service: ItemService = Depends(get_item_service),
-               filter_: str = Query("{}", alias="filter"),
-               range_: str = Query("[0, 500]", alias="range"),
-               sort: str = Query('["id","DESC"]', alias="sort")):
+               params: ListQueryParams = Depends(get_item_list_params),
+               after: Optional[UUID] = Query(
+                   None,
+                   description="Return the page following this item ID, "
+                   "as sent in X-Next-Cursor; preferred over large range "
+                   "offsets, which the database has to scan past"),
+               stream: bool = Query(
+                   False, description="Stream items as NDJSON lines"),
+               count: bool = Query(
+                   True,
+                   description="Count the matching items; when off, the "
+                   "total is sent as '*' and the count query is skipped")):
 
     logger.debug(f"User {current_user.username} listing items")
 
-    # Parse query parameters
-    params = parse_params(filter_, range_, sort)
-    filters = ItemFilters(**params.filters)
+    filters = params.filters
     offset, limit = calculate_pagination(params.range_list)
 
     # Fetch items
-    items, total = service.get_items(filters=filters,
-                                     offset=offset,
-                                     limit=limit,
-                                     sort_field=params.sort_field,
-                                     sort_order=params.sort_order)
-
-    # Convert to public schema
-    result = [to_public(item) for item in items]
+    items, total, has_more = service.get_items(filters=filters,
+                                               offset=offset,
+                                               limit=limit,
+                                               sort_field=params.sort_field,
+                                               sort_order=params.sort_order,
+                                               after=after,
+                                               count=count)
+
+    # The next page starts right after this page's last item; an empty
+    # range (limit 0) has no last item to continue from
+    next_cursor = str(items[-1].id) if has_more and items else None
+
+    # Build plain dicts and encode them directly, fetching order IDs for the
+    # whole page at once; returning a response skips response_model checks
+    order_ids = service.get_order_ids([item.id for item in items])
+    # Items are built and encoded a chunk at a time as the body is sent,
+    # rather than all up front
+    result = (to_public(item, order_ids[item.id]) for item in items)
+    if stream:
+        response = stream_ndjson(result)
+    else:
+        response = stream_json_array(result)
 
     # Set pagination headers
     set_pagination_headers(response=response,
-                           count=len(result),
+                           count=len(items),
                            total=total,
                            offset=offset,
-                           resource_name="items")
+                           resource_name="items",
+                           next_cursor=next_cursor)
 
-    logger.info(
-        f"User {current_user.username} retrieved {len(result)}/{total} items")
-    return result
+    logger.info(f"User {current_user.username} retrieved {len(items)}/"
+                f"{'*' if total is None else total} items")
+    return response
 
 
 @router.post("",
@@ -157,16 +220,20 @@ def create_item(item_in: ItemCreate,
     item = service.create(item_in)
 
     logger.info(f"User {current_user.username} created item {item.id}")
-    return to_public(item)
+    # A newly created item can't be booked by any order yet
+    return to_public_response(item, [], status_code=status.HTTP_201_CREATED)
 
 
 @router.get("/{item_id}",
             response_model=ItemPublic,
             summary="Get item by ID",
             description="Retrieve a specific item by its ID")
-def get_item(current_user: CurrentUser, item: Item = Depends(get_item_or_404)):
+def get_item(current_user: CurrentUser,
+             item: Item = Depends(get_item_or_404),
+             service: ItemService = Depends(get_item_service)):
+    order_ids = service.get_order_ids([item.id])
     logger.info(f"User {current_user.username} retrieved item {item.id}")
-    return to_public(item)
+    return to_public_response(item, order_ids[item.id])
 
 
 @router.get("/{item_id}/availability",
@@ -188,8 +255,9 @@ def check_availability(current_user: CurrentUser,
         item = service.check_availability(item, start_time, end_time,
                                           exclude_order_id)
 
+    order_ids = service.get_order_ids([item.id])
     logger.info(f"Availability checked for item {item.id}")
-    return to_public(item)
+    return to_public_response(item, order_ids[item.id])
 
 
 @router.put("/{item_id}",
@@ -204,8 +272,9 @@ def update_item(item_in: ItemUpdate,
 
     updated_item = service.update(item, item_in)
 
+    order_ids = service.get_order_ids([item.id])
     logger.info(f"User {current_user.username} updated item {item.id}")
-    return to_public(updated_item)
+    return to_public_response(updated_item, order_ids[item.id])
 
 
 @router.delete("/{item_id}",
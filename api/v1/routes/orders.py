@@ -1,5 +1,5 @@
 from typing import List
-from fastapi import APIRouter, Response, status, Depends, Query
+from fastapi import APIRouter, Response, status, Depends
 
 # --- Project Imports ---
 from services.order_service import OrderService
@@ -7,10 +7,12 @@ from core.logger import logger
 from core.dependencies import CurrentUser
 from core.database import SessionDep
 from core.exceptions import NotFoundException
-from core.query_utils import parse_params, calculate_pagination, set_pagination_headers
+from models.common import ListQueryParams
+from core.query_utils import list_params, calculate_pagination, set_pagination_headers
 from models.payment import PaymentPublic
 from models.order import (
     Order,
+    DeliveryInfo,
     OrderPublic,
     OrderCreate,
     OrderFilters,
@@ -57,15 +59,22 @@ def to_public(order: Order) -> OrderPublic:
 
     # Transform payments
     payments = [
-        PaymentPublic.model_validate(payment) for payment in order.payments
+        PaymentPublic.from_orm_fast(payment) for payment in order.payments
     ]
 
-    return OrderPublic.model_validate(order,
-                                      update={
-                                          "items": items,
-                                          "payments": payments
-                                      })
+    # The JSON column holds a plain dict, which still needs its schema
+    delivery_info = order.delivery_info
+    if delivery_info is not None:
+        delivery_info = DeliveryInfo.model_validate(delivery_info)
 
+    return OrderPublic.from_orm_fast(order,
+                                     items=items,
+                                     payments=payments,
+                                     delivery_info=delivery_info)
+
+
+# Filter, range and sort query parameters of the list endpoint
+get_order_list_params = list_params(OrderFilters, '["created_at", "DESC"]')
 
 # ---------- Route Handlers ----------
 
@@ -76,16 +85,12 @@ def to_public(order: Order) -> OrderPublic:
 def list_orders(response: Response,
                 current_user: CurrentUser,
                 service: OrderService = Depends(get_order_service),
-                filter_: str = Query("{}", alias="filter"),
-                range_: str = Query("[0, 500]", alias="range"),
-                sort: str = Query('["created_at", "DESC"]', alias="sort")):
+                params: ListQueryParams = Depends(get_order_list_params)):
     """List orders with filtering, sorting, and pagination"""
 
     logger.debug(f"User {current_user.username} listing orders")
 
-    # Parse query parameters
-    params = parse_params(filter_, range_, sort)
-    filters = OrderFilters(**params.filters)
+    filters = params.filters
     offset, limit = calculate_pagination(params.range_list)
 
     # Fetch orders
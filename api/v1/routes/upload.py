@@ -2,6 +2,7 @@ import io
 from pathlib import Path
 from uuid import uuid4
 from fastapi import APIRouter, UploadFile, File, status
+from fastapi.concurrency import run_in_threadpool
 from PIL import Image, ImageOps
 
 # --- Project Imports ---
@@ -109,7 +110,9 @@ async def upload_image(current_user: CurrentUser,
     new_filename = f"{uuid4()}.jpg"
     output_path = Path(settings.UPLOAD_DIR) / new_filename
 
-    processing_info = create_thumbnail(image_data, output_path)
+    # Decoding and resizing is CPU-bound, keep it off the event loop
+    processing_info = await run_in_threadpool(create_thumbnail, image_data,
+                                              output_path)
 
     logger.info(
         f"Image uploaded successfully to {output_path} by '{current_user.username}'"
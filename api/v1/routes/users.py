@@ -1,9 +1,10 @@
 # coding: UTF-8
 from uuid import UUID
-from fastapi import APIRouter, Depends, Query, Response, status
+from fastapi import APIRouter, Depends, Response, status
 
 # --- Project Imports ---
-from core.query_utils import parse_params, calculate_pagination, set_pagination_headers
+from models.common import ListQueryParams
+from core.query_utils import list_params, calculate_pagination, set_pagination_headers
 from core.logger import logger
 from core.dependencies import CurrentUser
 from core.database import SessionDep
@@ -31,6 +32,9 @@ def get_user_or_404(
     return user
 
 
+# Filter, range and sort query parameters of the list endpoint
+get_user_list_params = list_params(UserFilters, '["id","DESC"]')
+
 # ---------- Routes ----------
 
 
@@ -41,14 +45,11 @@ def get_user_or_404(
 def list_users(response: Response,
                current_user: CurrentUser,
                service: UserService = Depends(get_user_service),
-               filter_: str = Query("{}", alias="filter"),
-               range_: str = Query("[0, 500]", alias="range"),
-               sort: str = Query('["id","DESC"]', alias="sort")):
+               params: ListQueryParams = Depends(get_user_list_params)):
     """List users with filtering, sorting, and pagination"""
     logger.debug(f"User {current_user.username} listing users")
 
-    params = parse_params(filter_, range_, sort)
-    filters = UserFilters(**params.filters)
+    filters = params.filters
     offset, limit = calculate_pagination(params.range_list)
 
     users, total = service.get_users(filters=filters,
@@ -57,8 +58,13 @@ def list_users(response: Response,
                                      sort_field=params.sort_field,
                                      sort_order=params.sort_order)
 
-    result = [UserPublic.model_validate(user) for user in users]
-    set_pagination_headers(response, offset, len(result), total)
+    # Rows are trusted, so build the schemas without re-validating them
+    result = [UserPublic.from_orm_fast(user) for user in users]
+    set_pagination_headers(response=response,
+                           count=len(result),
+                           total=total,
+                           offset=offset,
+                           resource_name="users")
 
     logger.info(f"Fetched {len(result)} users out of {total} total")
     return result
@@ -75,9 +81,9 @@ def create_user(user_in: UserCreate,
     """Create a new user account"""
     logger.debug(f"User {current_user.username} creating user")
 
-    user = service.create_user(user_in)
+    user = service.create(user_in)
     logger.info(f"User {current_user.username} created user {user.id}")
-    return UserPublic.model_validate(user)
+    return UserPublic.from_orm_fast(user)
 
 
 @router.get("/me",
@@ -87,7 +93,7 @@ def create_user(user_in: UserCreate,
 def read_current_user(current_user: CurrentUser) -> UserPublic:
     """Get the current authenticated user's profile"""
     logger.debug(f"Fetching profile for current user: {current_user.username}")
-    return UserPublic.model_validate(current_user)
+    return UserPublic.from_orm_fast(current_user)
 
 
 @router.get("/{user_id}",
@@ -98,4 +104,4 @@ def read_user_by_id(current_user: CurrentUser,
                     user: User = Depends(get_user_or_404)):
     """Get a specific user by ID"""
     logger.info(f"User {current_user.username} retrieved user {user.id}")
-    return UserPublic.model_validate(user)
+    return UserPublic.from_orm_fast(user)
@@ -4,6 +4,7 @@ from datetime import datetime, timedelta, timezone
 from typing import Optional
 from pydantic import ValidationError
 from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer
 from argon2 import exceptions as argon2_exceptions
 from authlib.integrations.starlette_client import OAuth
@@ -154,24 +155,30 @@ class AuthService:
                 raise AuthenticationException(
                     "Could not verify Google account.")
 
-            email = user_info["email"]
-            user = get_user_by_email(session, email)
-            username = user_info.get("name",
-                                     email.split("@")[0].replace(" ", "_"))
-
-            if not user:
-                logger.info(f"Creating new external user: {email}")
-                user_create = UserCreate(username=username,
-                                         email=email,
-                                         avatar=user_info.get("picture"),
-                                         is_external=True)
-                user = create_user(session, user_create)
-
-            return user
+            # Database calls are blocking, keep them off the event loop
+            return await run_in_threadpool(self.get_or_create_external_user,
+                                           session, user_info)
         except Exception as e:
             logger.error(f"Google OAuth failed: {e}")
             raise AuthenticationException("OAuth authentication failed")
 
+    def get_or_create_external_user(self, session: SessionDep,
+                                    user_info: dict) -> User:
+        """Finds the user for a verified OAuth profile or creates one."""
+        email = user_info["email"]
+        user = get_user_by_email(session, email)
+        username = user_info.get("name", email.split("@")[0].replace(" ", "_"))
+
+        if not user:
+            logger.info(f"Creating new external user: {email}")
+            user_create = UserCreate(username=username,
+                                     email=email,
+                                     avatar=user_info.get("picture"),
+                                     is_external=True)
+            user = create_user(session, user_create)
+
+        return user
+
 
 # --- Service Instance ---
 # Create a single, reusable instance of the AuthService
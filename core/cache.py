@@ -0,0 +1,54 @@
+# In-process caching
+
+# --- Core Imports ---
+import time
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+# --- Project Imports ---
+from core.config import settings
+from core.logger import logger
+
+
+class TTLCache:
+    """
+    Thread-safe in-memory cache whose entries expire after `ttl_seconds`.
+    Entries are grouped by namespace so writers can drop a whole group.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[Tuple[str, Hashable], Tuple[float, Any]] = {}
+        self._generations: Dict[str, int] = {}
+        self._lock = Lock()
+
+    def get_or_set(self, namespace: str, key: Hashable,
+                   factory: Callable[[], Any]) -> Any:
+        """Returns the cached value, computing it with `factory` on a miss"""
+        entry = self._entries.get((namespace, key))
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+
+        generation = self._generations.get(namespace, 0)
+        value = factory()
+
+        with self._lock:
+            # Don't store values computed before a concurrent invalidation
+            if self._generations.get(namespace, 0) == generation:
+                expires_at = time.monotonic() + self.ttl_seconds
+                self._entries[(namespace, key)] = (expires_at, value)
+        return value
+
+    def invalidate(self, namespace: str) -> None:
+        """Drops every entry in the namespace"""
+        with self._lock:
+            self._generations[namespace] = (
+                self._generations.get(namespace, 0) + 1)
+            for cache_key in [k for k in self._entries if k[0] == namespace]:
+                del self._entries[cache_key]
+        logger.debug(f"Cache namespace '{namespace}' invalidated")
+
+
+# Distinct values backing the item dropdown endpoints
+DROPDOWN_NAMESPACE = "dropdowns"
+dropdown_cache = TTLCache(settings.DROPDOWN_CACHE_TTL_SECONDS)
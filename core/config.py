@@ -1,3 +1,4 @@
+import os
 import secrets
 from typing import List, Optional
 from pathlib import Path
@@ -35,6 +36,26 @@ class Settings(BaseSettings):
     # Files
     UPLOAD_DIR: str = "static/images"
 
+    # Serialization
+    # Build response schemas from database rows without re-validating them
+    FAST_SERIALIZE: bool = True
+
+    # Caching
+    # Lifetime of cached dropdown options; writes in this process clear them
+    DROPDOWN_CACHE_TTL_SECONDS: int = 300
+
+    # Database
+    # Compiled SQL kept per engine; list queries vary in filter and sort
+    # combinations, so allow more shapes than SQLAlchemy's default of 500
+    DB_QUERY_CACHE_SIZE: int = 1200
+    # Connections kept open, plus extra ones opened under load; sync routes
+    # run in a threadpool, so each busy worker thread holds one
+    DB_POOL_SIZE: int = Field(
+        default_factory=lambda: max(10, (os.cpu_count() or 1) * 2))
+    DB_MAX_OVERFLOW: int = 20
+    # Reconnect before MySQL's wait_timeout drops idle connections
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+
     # CORS
     BACKEND_CORS_ORIGINS: List[str] = [
         "http://127.0.0.1:5233",
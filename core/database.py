@@ -1,5 +1,6 @@
 # Core database functionality
 import secrets
+from contextlib import contextmanager
 from typing import Generator, Annotated
 from fastapi import Depends
 from sqlmodel import Session, SQLModel, create_engine, select, func
@@ -11,7 +12,13 @@ from core.logger import logger
 from models.user import User, UserCreate
 from core.exceptions import InternalErrorException
 
-engine = create_engine(settings.database_url, echo=False)
+engine = create_engine(settings.database_url,
+                       echo=False,
+                       query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+                       pool_size=settings.DB_POOL_SIZE,
+                       max_overflow=settings.DB_MAX_OVERFLOW,
+                       pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+                       pool_pre_ping=True)
 ph = PasswordHasher()
 
 
@@ -29,6 +36,20 @@ def get_session() -> Generator[Session, None, None]:
 SessionDep = Annotated[Session, Depends(get_session)]
 
 
+@contextmanager
+def keep_loaded(session: Session) -> Generator[Session, None, None]:
+    """
+    Commits inside the block leave loaded objects as they are, so an object
+    that was just written can be returned without reloading it
+    """
+    expire_on_commit = session.expire_on_commit
+    session.expire_on_commit = False
+    try:
+        yield session
+    finally:
+        session.expire_on_commit = expire_on_commit
+
+
 def hash_password(password: str) -> str:
     return ph.hash(password)
 
@@ -58,8 +79,8 @@ def create_user(session: Session, user_in: UserCreate) -> User:
 
     try:
         session.add(db_user)
-        session.commit()
-        session.refresh(db_user)
+        with keep_loaded(session):
+            session.commit()
         logger.info(
             f"User {db_user.username} created successfully (id={db_user.id})")
         return db_user
@@ -70,7 +91,24 @@ def create_user(session: Session, user_in: UserCreate) -> User:
             "An unexpected error occurred while creating the user.")
 
 
+def count_query(stmt):
+    """Builds a query counting the rows returned by a list statement"""
+    # Ordering does not affect the count, so keep it out of the subquery
+    return select(func.count()).select_from(stmt.order_by(None).subquery())
+
+
 def get_total_count(session: Session, stmt) -> int:
     """Executes a count query to get the total number of records"""
-    count_stmt = select(func.count()).select_from(stmt.subquery())
+    return session.exec(count_query(stmt)).one()
+
+
+def get_page_total(session: Session, count_stmt, offset: int, limit: int,
+                   page_size: int) -> int:
+    """
+    Returns the total number of records for a fetched page.
+    A short, non-empty page (or a short first page) is the last one, so the
+    total is known without running `count_stmt`.
+    """
+    if page_size < limit and (page_size > 0 or offset == 0):
+        return offset + page_size
     return session.exec(count_stmt).one()
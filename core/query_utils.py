@@ -1,47 +1,135 @@
 # Query utilities
 
 # --- Core Imports ---
-import json
-from typing import List
-from fastapi import Response
+import orjson
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Type
+from fastapi import Query, Response
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import and_, or_
 
 # --- Project Imports ---
 from core.logger import logger
 from models.common import ListQueryParams
 from core.exceptions import BadRequestException
 
+# Upper bound on rows returned by a single list request
+MAX_PAGE_SIZE = 500
 
-def parse_params(filter_str: str, range_str: str,
-                 sort_str: str) -> ListQueryParams:
-    """Parses and validates list query parameters from JSON strings."""
+# Parsed list parameters kept in memory, and the longest string cached
+PARAMS_CACHE_SIZE = 1024
+MAX_CACHED_PARAM_LENGTH = 1024
+
+
+def parse_params(filter_str: str,
+                 range_str: str,
+                 sort_str: str,
+                 filters_model: Optional[Type[BaseModel]] = None
+                 ) -> ListQueryParams:
+    """
+    Parses and validates list query parameters from JSON strings.
+    When `filters_model` is given, the filter JSON is parsed and validated
+    into it in a single pass; otherwise filters are returned as a dict.
+    Clients resend the same parameters constantly, so short ones are served
+    from a cache; each call still gets its own copy of the result.
+    """
+    if max(len(filter_str), len(range_str),
+           len(sort_str)) > MAX_CACHED_PARAM_LENGTH:
+        return _parse_params(filter_str, range_str, sort_str, filters_model)
+
+    params = _parse_params_cached(filter_str, range_str, sort_str,
+                                  filters_model)
+    filters = params.filters
+    if isinstance(filters, BaseModel):
+        filters = filters.model_copy()
+    else:
+        filters = dict(filters)
+    return params.model_copy(update={
+        "filters": filters,
+        "range_list": list(params.range_list)
+    })
+
+
+def _parse_params(filter_str: str, range_str: str, sort_str: str,
+                  filters_model: Optional[Type[BaseModel]]
+                  ) -> ListQueryParams:
+    """Parses the query parameters without caching"""
     try:
-        filters = json.loads(filter_str)
-        range_list = json.loads(range_str)
-        sort_field, sort_order = json.loads(sort_str)
+        if filters_model is not None:
+            filters = filters_model.model_validate_json(filter_str)
+        else:
+            filters = orjson.loads(filter_str)
+        range_list = orjson.loads(range_str)
+        sort_field, sort_order = orjson.loads(sort_str)
 
         return ListQueryParams(filters=filters,
                                range_list=range_list,
                                sort_field=sort_field,
                                sort_order=sort_order.upper())
-    except (ValueError) as e:
+    except (ValueError, ValidationError) as e:
         raise BadRequestException(f"Invalid query parameters format: {e}")
 
 
+# Invalid parameters raise, so only successful parses are cached
+_parse_params_cached = lru_cache(maxsize=PARAMS_CACHE_SIZE)(_parse_params)
+
+
+def list_params(filters_model: Type[BaseModel],
+                default_sort: str = '["id","ASC"]'):
+    """
+    Builds a dependency that reads the filter, range and sort list query
+    parameters and parses them into `filters_model` with `parse_params`.
+    Parsing is cheap and usually cached, so the dependency runs on the
+    event loop instead of taking a worker thread.
+    """
+
+    async def dependency(filter_: str = Query("{}", alias="filter"),
+                         range_: str = Query("[0, 500]", alias="range"),
+                         sort: str = Query(default_sort, alias="sort")
+                         ) -> ListQueryParams:
+        return parse_params(filter_, range_, sort, filters_model)
+
+    return dependency
+
+
 def calculate_pagination(range_list: List[int]) -> tuple[int, int]:
     """Calculates offset and limit for a database query from a range list"""
-    offset = range_list[0]
-    limit = range_list[1] - range_list[0] + 1
+    offset = max(range_list[0], 0)
+    limit = min(max(range_list[1] - offset + 1, 0), MAX_PAGE_SIZE)
     return offset, limit
 
 
-def apply_sorting(stmt, model: object, sort_field: str, sort_order: str):
-    """Applies sorting to a SQLAlchemy statement"""
+def sort_columns(model: object, fields: Iterable[str]) -> Dict[str, Any]:
+    """Maps sortable field names to the model's columns, once at import"""
+    return {field: getattr(model, field) for field in fields}
+
+
+def apply_sorting(stmt,
+                  model: object,
+                  sort_field: str,
+                  sort_order: str,
+                  allowed_columns: Optional[Mapping[str, Any]] = None):
+    """
+    Applies sorting to a SQLAlchemy statement.
+    When `allowed_columns` (see `sort_columns`) is given, the column is
+    looked up there and other sort fields are rejected.
+    """
+    if allowed_columns is not None and sort_field not in allowed_columns:
+        raise BadRequestException(f"Cannot sort by '{sort_field}'")
+
     try:
-        sort_column = getattr(model, sort_field)
+        if allowed_columns is not None:
+            sort_column = allowed_columns[sort_field]
+        else:
+            sort_column = getattr(model, sort_field)
+        columns = [sort_column]
+        # Break ties on the primary key so rows don't shift between pages
+        if sort_field != "id" and hasattr(model, "id"):
+            columns.append(model.id)
         if sort_order == "ASC":
-            return stmt.order_by(sort_column.asc())
+            return stmt.order_by(*(column.asc() for column in columns))
         # Default to DESC for safety
-        return stmt.order_by(sort_column.desc())
+        return stmt.order_by(*(column.desc() for column in columns))
     except AttributeError:
         logger.warning(
             f"Invalid sort field '{sort_field}', using default sorting")
@@ -51,16 +139,50 @@ def apply_sorting(stmt, model: object, sort_field: str, sort_order: str):
         return stmt
 
 
+def apply_keyset(stmt, sort_column, id_column, sort_order: str,
+                 sort_value: Any, last_id: Any):
+    """
+    Restricts a statement sorted by `apply_sorting` to the rows following
+    the row (`sort_value`, `last_id`), so the database seeks along the index
+    instead of skipping an offset. NULLs sort first ascending, as they do
+    on SQLite and MySQL.
+    """
+    ascending = sort_order == "ASC"
+    after_id = id_column > last_id if ascending else id_column < last_id
+    if sort_column is id_column:
+        return stmt.where(after_id)
+
+    if sort_value is None:
+        tie = and_(sort_column.is_(None), after_id)
+        if ascending:
+            return stmt.where(or_(tie, sort_column.is_not(None)))
+        return stmt.where(tie)
+
+    tie = and_(sort_column == sort_value, after_id)
+    if ascending:
+        return stmt.where(or_(sort_column > sort_value, tie))
+    return stmt.where(
+        or_(sort_column < sort_value, tie, sort_column.is_(None)))
+
+
 def set_pagination_headers(response: Response,
                            count: int,
-                           total: int,
+                           total: Optional[int],
                            offset: int,
-                           resource_name: str = "items"):
-    """Sets standard pagination headers on the response."""
+                           resource_name: str = "items",
+                           next_cursor: Optional[str] = None):
+    """
+    Sets standard pagination headers on the response.
+    `next_cursor`, when given, is sent as X-Next-Cursor for keyset paging.
+    An unknown `total` is sent as "*" and X-Total-Count is left out.
+    """
     end_index = offset + count - 1 if count > 0 else offset
-    content_range = f"{resource_name} {offset}-{end_index}/{total}"
+    content_range = f"{resource_name} {offset}-{end_index}/"
+    content_range += "*" if total is None else str(total)
 
+    # CORSMiddleware in main.py exposes these headers to browser clients
     response.headers["Content-Range"] = content_range
-    response.headers["X-Total-Count"] = str(total)
-    response.headers[
-        "Access-Control-Expose-Headers"] = "Content-Range, X-Total-Count"
+    if total is not None:
+        response.headers["X-Total-Count"] = str(total)
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
@@ -0,0 +1,80 @@
+# Response utilities
+
+# --- Core Imports ---
+import hashlib
+import orjson
+from typing import Any, Iterable, Iterator, Optional
+from pydantic import BaseModel
+from fastapi import Response, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+
+# Number of rows encoded per streamed chunk
+STREAM_CHUNK_SIZE = 32
+
+
+def iter_json_array(rows: Iterable[BaseModel | Any],
+                    chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Encodes models, or JSON-serializable rows, as a JSON array, yielding a
+    few rows at a time
+    """
+    yield b"["
+    separator = b""
+    chunk = []
+    for row in rows:
+        if isinstance(row, BaseModel):
+            row = row.model_dump()
+        chunk.append(orjson.dumps(row))
+        if len(chunk) == chunk_size:
+            yield separator + b",".join(chunk)
+            separator, chunk = b",", []
+    if chunk:
+        yield separator + b",".join(chunk)
+    yield b"]"
+
+
+def stream_json_array(rows: Iterable[BaseModel | Any]) -> StreamingResponse:
+    """
+    Streams models or rows as a JSON array instead of building the whole
+    body first. Rows are encoded as they are consumed, so a lazy iterable
+    keeps only one chunk of rows serialized in memory at a time.
+    """
+    return StreamingResponse(iter_json_array(rows),
+                             media_type="application/json")
+
+
+def iter_ndjson(rows: Iterable[Any],
+                chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    """Encodes rows as newline-delimited JSON, a few lines at a time"""
+    chunk = []
+    for row in rows:
+        chunk.append(orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE))
+        if len(chunk) == chunk_size:
+            yield b"".join(chunk)
+            chunk = []
+    if chunk:
+        yield b"".join(chunk)
+
+
+def stream_ndjson(rows: Iterable[Any]) -> StreamingResponse:
+    """Streams JSON-serializable rows as NDJSON, one object per line"""
+    return StreamingResponse(iter_ndjson(rows),
+                             media_type="application/x-ndjson")
+
+
+def cached_json_response(content: Any,
+                         if_none_match: Optional[str] = None) -> Response:
+    """
+    Encodes content with a weak ETag derived from the body, answering 304
+    Not Modified when the client's If-None-Match already holds that tag.
+    """
+    body = orjson.dumps(content)
+    etag = f'W/"{hashlib.md5(body).hexdigest()}"'
+    if if_none_match:
+        tags = {tag.strip() for tag in if_none_match.split(",")}
+        if etag in tags or "*" in tags:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED,
+                            headers={"ETag": etag})
+    return Response(body,
+                    media_type=ORJSONResponse.media_type,
+                    headers={"ETag": etag})
@@ -5,7 +5,7 @@ import os
 import uvicorn
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import PlainTextResponse
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 from contextlib import asynccontextmanager
 from starlette.middleware.sessions import SessionMiddleware
 from fastapi.middleware.cors import CORSMiddleware
@@ -29,7 +29,7 @@ async def lifespan(app: FastAPI):
     try:
         create_db_and_tables()
     except Exception as e:
-        print("PRE starting error: ", e)
+        logger.error(f"PRE starting error: {e}")
         raise
     yield
 
@@ -41,6 +41,7 @@ app = FastAPI(title="Rentory",
               docs_url="/docs",
               redoc_url="/redoc",
               lifespan=lifespan,
+              default_response_class=ORJSONResponse,
               description="""
 ## API Versions
 - **v1**: Current stable version
@@ -53,7 +54,9 @@ app.add_middleware(CORSMiddleware,
                    allow_credentials=True,
                    allow_methods=["*"],
                    allow_headers=["*"],
-                   expose_headers=["Content-Range"])
+                   expose_headers=[
+                       "Content-Range", "X-Total-Count", "X-Next-Cursor"
+                   ])
 
 
 # Routes
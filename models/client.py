@@ -1,9 +1,9 @@
 from uuid import UUID
-from pydantic import EmailStr, BaseModel, field_serializer
+from pydantic import EmailStr, BaseModel, field_validator
 from pydantic_extra_types.phone_numbers import PhoneNumber
 
 from typing import Optional, List, TYPE_CHECKING
-from sqlmodel import Field, SQLModel, Relationship
+from sqlmodel import Field, SQLModel, Relationship, Index
 
 from models.common import UUIDMixin, TimestampMixin
 
@@ -20,9 +20,14 @@ class Phone(PhoneNumber):
 
 class Client(UUIDMixin, TimestampMixin, table=True):
     """Represents a customer in the system"""
+    __table_args__ = (
+        # Client lists may be sorted by the timestamps
+        Index("ix_client_created_at", "created_at"),
+        Index("ix_client_updated_at", "updated_at"),
+    )
 
     given_name: Optional[str] = Field(max_length=255, index=True)
-    surname: Optional[str] = Field(max_length=255)
+    surname: Optional[str] = Field(max_length=255, index=True)
     phone: Phone = Field(unique=True, max_length=20, index=True)
     instagram: Optional[str] = Field(max_length=255, index=True)
     email: Optional[EmailStr] = Field(max_length=255, index=True)
@@ -73,3 +78,16 @@ class ClientFilters(BaseModel):
     surname: Optional[str] = None
     discount: Optional[int] = None
     is_archived: Optional[bool] = None
+
+    @field_validator("phone",
+                     "instagram",
+                     "email",
+                     "given_name",
+                     "surname",
+                     mode="before")
+    @classmethod
+    def strip_search_term(cls, value):
+        """Trim search terms so blank input doesn't become a '%%' scan"""
+        if isinstance(value, str):
+            return value.strip() or None
+        return value
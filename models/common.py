@@ -4,6 +4,8 @@ from pydantic import BaseModel
 from typing import List, Dict, Any
 from sqlmodel import Field, SQLModel
 
+from core.config import settings
+
 
 class UUIDMixin(SQLModel):
     """Mixin for models with UUID primary key"""
@@ -27,9 +29,29 @@ class TimestampMixin(SQLModel):
         })
 
 
+class FastPublicMixin:
+    """Mixin for response schemas built from trusted database rows"""
+
+    @classmethod
+    def from_orm_fast(cls, obj, **update):
+        """
+        Builds the schema from an ORM object, with `update` overriding fields.
+        Rows were validated on write, so validation is skipped unless
+        FAST_SERIALIZE is turned off.
+        """
+        if not settings.FAST_SERIALIZE:
+            return cls.model_validate(obj, update=update)
+
+        values = {
+            field: getattr(obj, field)
+            for field in cls.model_fields if field not in update
+        }
+        return cls.model_construct(**values, **update)
+
+
 class ListQueryParams(BaseModel):
     """A container for parsed list query parameters"""
-    filters: Dict[str, Any]
+    filters: Dict[str, Any] | BaseModel
     range_list: List[int]
     sort_field: str
     sort_order: str
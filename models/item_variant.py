@@ -2,9 +2,9 @@ from uuid import UUID
 from enum import Enum
 from datetime import date
 from typing import Optional, List, TYPE_CHECKING
-from sqlmodel import Field, SQLModel, Relationship
+from sqlmodel import Field, SQLModel, Relationship, Index
 
-from models.common import UUIDMixin, TimestampMixin
+from models.common import UUIDMixin, TimestampMixin, FastPublicMixin
 if TYPE_CHECKING:
     from models.item import Item
     from models.links import OrderItemLink
@@ -34,6 +34,13 @@ class ItemVariantPrice(UUIDMixin, SQLModel, table=True):
 
 class ItemVariant(UUIDMixin, TimestampMixin, SQLModel, table=True):
     """Represents a specific variant of an item (e.g., size M, color Red)"""
+    __table_args__ = (
+        # Variant lists filter by item and status together
+        Index("ix_itemvariant_item_id_status", "item_id", "status"),
+        # Maintenance checks filter on the service window
+        Index("ix_itemvariant_service_window", "service_start_time",
+              "service_end_time"),
+    )
     quantity: int = Field(default=1, ge=0)
     size: Optional[str] = Field(default=None, max_length=50)
     color: Optional[str] = Field(default=None, max_length=50)
@@ -45,8 +52,12 @@ class ItemVariant(UUIDMixin, TimestampMixin, SQLModel, table=True):
 
     item_id: UUID = Field(foreign_key="item.id", index=True)
     item: Optional["Item"] = Relationship(back_populates="variants")
-    prices: List["ItemVariantPrice"] = Relationship(back_populates="variant",
-                                                    cascade_delete=True)
+    # Every variant response includes its prices, so load them for all the
+    # variants of a query at once rather than one query per variant
+    prices: List["ItemVariantPrice"] = Relationship(
+        back_populates="variant",
+        cascade_delete=True,
+        sa_relationship_kwargs={"lazy": "selectin"})
     order_links: List["OrderItemLink"] = Relationship(
         back_populates="item_variant")
 
@@ -54,7 +65,7 @@ class ItemVariant(UUIDMixin, TimestampMixin, SQLModel, table=True):
 # ---------- Database Model ----------
 
 
-class ItemVariantPriceBase(SQLModel):
+class ItemVariantPriceBase(FastPublicMixin, SQLModel):
     id: Optional[UUID] = None
     amount: int
     deposit: Optional[int] = Field(default=0, ge=0)
@@ -93,7 +104,7 @@ class ItemVariantPublicInternal(ItemVariantBase):
     id: UUID
 
 
-class ItemVariantPublic(ItemVariantBase):
+class ItemVariantPublic(FastPublicMixin, ItemVariantBase):
     id: UUID
     item_id: UUID
 
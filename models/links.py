@@ -1,6 +1,6 @@
 from uuid import UUID
 from typing import Optional, TYPE_CHECKING
-from sqlmodel import Field, SQLModel, Relationship
+from sqlmodel import Field, SQLModel, Relationship, Index
 
 if TYPE_CHECKING:
     from models.order import Order
@@ -8,6 +8,13 @@ if TYPE_CHECKING:
 
 
 class OrderItemLink(SQLModel, table=True):
+    __table_args__ = (
+        # The primary key leads with order_id; booking and order ID lookups
+        # start from the variant instead
+        Index("ix_orderitemlink_variant_order", "item_variant_id",
+              "order_id"),
+    )
+
     order_id: int = Field(foreign_key="order.id",
                           primary_key=True,
                           ondelete="CASCADE")
@@ -2,9 +2,9 @@ from uuid import UUID
 from enum import Enum
 from datetime import datetime, date
 from typing import Optional, List, TYPE_CHECKING
-from sqlmodel import Field, SQLModel, Relationship, Column, JSON
+from sqlmodel import Field, SQLModel, Relationship, Column, JSON, Index
 
-from models.common import TimestampMixin
+from models.common import TimestampMixin, FastPublicMixin
 from models.payment import Payment, PaymentBase, PaymentPublic
 
 if TYPE_CHECKING:
@@ -57,6 +57,13 @@ class OrderItemPublicInfo(SQLModel):
 
 
 class Order(TimestampMixin, SQLModel, table=True):
+    __table_args__ = (
+        # Booking conflict checks match active statuses, skip archived
+        # orders and then compare the rental period
+        Index("ix_order_status_archived_period", "status", "is_archived",
+              "start_time", "end_time"),
+    )
+
     id: int | None = Field(default=None, primary_key=True)
     status: OrderStatus = Field(default=OrderStatus.BOOKED, index=True)
     client_id: UUID = Field(foreign_key="client.id", index=True)
@@ -117,7 +124,7 @@ class OrderUpdate(SQLModel):
     payments: Optional[List[PaymentBase]] = None
 
 
-class OrderPublic(OrderBase):
+class OrderPublic(FastPublicMixin, OrderBase):
     id: int
     created_at: datetime
     updated_at: datetime
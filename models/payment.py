@@ -4,7 +4,7 @@ from datetime import datetime
 from typing import Optional, TYPE_CHECKING
 from sqlmodel import Field, SQLModel, Relationship
 
-from models.common import TimestampMixin, UUIDMixin
+from models.common import TimestampMixin, UUIDMixin, FastPublicMixin
 
 if TYPE_CHECKING:
     from models.order import Order
@@ -47,7 +47,7 @@ class PaymentBase(SQLModel):
     note: Optional[str] = None
 
 
-class PaymentPublic(PaymentBase):
+class PaymentPublic(FastPublicMixin, PaymentBase):
     id: UUID
     created_at: datetime
     updated_at: datetime
@@ -3,7 +3,7 @@ from typing import Optional, List
 from pydantic import EmailStr
 from sqlmodel import Field, SQLModel
 
-from models.common import UUIDMixin, TimestampMixin
+from models.common import UUIDMixin, TimestampMixin, FastPublicMixin
 
 # ---------- Base Schemas ----------
 
@@ -62,7 +62,7 @@ class UpdatePassword(SQLModel):
     new_password: str = Field(min_length=8, max_length=40)
 
 
-class UserPublic(UserBase):
+class UserPublic(FastPublicMixin, UserBase):
     id: UUID
     is_active: bool
     is_superuser: bool
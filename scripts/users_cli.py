@@ -22,6 +22,9 @@ from models.user import User, UserCreate
 
 console = Console()
 
+# Rows fetched from the database per round trip when listing users
+USER_BATCH_SIZE = 128
+
 
 @click.group()
 def cli() -> None:
@@ -33,10 +36,9 @@ def cli() -> None:
 def list_users() -> None:
     """List all users."""
     with Session(engine) as session:
-        users = session.exec(select(User)).all()
-        if not users:
-            console.print("[yellow]No users found[/yellow]")
-            return
+        # Fetch users in batches instead of loading the whole table at once
+        stmt = select(User).execution_options(yield_per=USER_BATCH_SIZE)
+        result = session.exec(stmt)
 
         table = Table(title="Rentory Users", box=box.SQUARE)
         table.add_column("ID")
@@ -46,10 +48,15 @@ def list_users() -> None:
         table.add_column("Admin")
         table.add_column("External")
 
-        for user in users:
-            table.add_row(str(user.id), user.username, user.email,
-                          str(user.is_active), str(user.is_superuser),
-                          str(user.is_external))
+        for partition in result.partitions():
+            for user in partition:
+                table.add_row(str(user.id), user.username, user.email,
+                              str(user.is_active), str(user.is_superuser),
+                              str(user.is_external))
+
+        if not table.row_count:
+            console.print("[yellow]No users found[/yellow]")
+            return
         console.print(table)
 
 
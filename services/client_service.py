@@ -1,13 +1,14 @@
 from uuid import UUID
 from typing import List
-from sqlmodel import select, func
+from sqlmodel import select, func, delete, exists
+from sqlalchemy.exc import IntegrityError
 from datetime import datetime, timezone
 
 # --- Project Imports ---
-from core.query_utils import apply_sorting
+from core.query_utils import apply_sorting, sort_columns
 from core.logger import logger
 from core.database import SessionDep
-from core.database import get_total_count
+from core.database import get_page_total, keep_loaded
 from core.exceptions import ConflictException, BadRequestException
 from models.order import Order
 from models.client import Client, ClientCreate, ClientUpdate, ClientFilters
@@ -16,30 +17,37 @@ from models.client import Client, ClientCreate, ClientUpdate, ClientFilters
 class ClientService:
     """Business logic for client operations"""
 
+    # Columns clients may be sorted by, all backed by an index
+    SORT_COLUMNS = sort_columns(Client, (
+        "id", "phone", "email", "instagram", "given_name", "surname",
+        "created_at", "updated_at"))
+
     def __init__(self, session: SessionDep):
         self.session = session
 
-    def _apply_filters(self, stmt, filters: ClientFilters):
-        """Apply filters to client query"""
+    def _build_conditions(self, filters: ClientFilters) -> list:
+        """Build WHERE conditions shared by the list and count queries"""
+        conditions = []
         if filters.id:
-            stmt = stmt.where(Client.id.in_(filters.id))
+            conditions.append(Client.id.in_(filters.id))
         if filters.phone:
-            stmt = stmt.where(Client.phone.ilike(f"%{filters.phone}%"))
+            conditions.append(Client.phone.ilike(f"%{filters.phone}%"))
         if filters.email:
-            stmt = stmt.where(Client.email.ilike(f"%{filters.email}%"))
+            conditions.append(Client.email.ilike(f"%{filters.email}%"))
         if filters.instagram:
-            stmt = stmt.where(Client.instagram.ilike(f"%{filters.instagram}%"))
+            conditions.append(
+                Client.instagram.ilike(f"%{filters.instagram}%"))
         if filters.given_name:
-            stmt = stmt.where(
+            conditions.append(
                 Client.given_name.ilike(f"%{filters.given_name}%"))
         if filters.surname:
-            stmt = stmt.where(Client.surname.ilike(f"%{filters.surname}%"))
+            conditions.append(Client.surname.ilike(f"%{filters.surname}%"))
         if filters.discount is not None:
-            stmt = stmt.where(Client.discount == filters.discount)
+            conditions.append(Client.discount == filters.discount)
         if filters.is_archived is not None:
-            stmt = stmt.where(Client.is_archived == filters.is_archived)
+            conditions.append(Client.is_archived == filters.is_archived)
 
-        return stmt.distinct()
+        return conditions
 
     def get_by_id(self, client_id: UUID) -> Client:
         """Get client by ID"""
@@ -53,35 +61,55 @@ class ClientService:
                     sort_field: str = "id",
                     sort_order: str = "ASC") -> tuple[List[Client], int]:
         """Get filtered and paginated clients with total count"""
-        stmt = select(Client)
-        stmt = self._apply_filters(stmt, filters)
-        stmt = apply_sorting(stmt, Client, sort_field, sort_order)
+        # Filters only touch Client columns, so rows can't repeat and the
+        # count can run directly on the table without a subquery
+        conditions = self._build_conditions(filters)
+        stmt = select(Client).where(*conditions)
+        stmt = apply_sorting(stmt, Client, sort_field, sort_order,
+                             self.SORT_COLUMNS)
+        count_stmt = select(func.count()).select_from(Client).where(
+            *conditions)
+
+        clients = self.session.exec(stmt.offset(offset).limit(limit)).all()
+        total = get_page_total(self.session, count_stmt, offset, limit,
+                               len(clients))
 
-        # Get total count before pagination
-        total = get_total_count(self.session, stmt)
+        return clients, total
 
-        stmt = stmt.offset(offset).limit(limit)
-        clients = self.session.exec(stmt).all()
+    def get_order_ids(self, client_ids: List[UUID]) -> dict[UUID, List[int]]:
+        """Map each client ID to its order IDs using a single query"""
+        order_ids = {client_id: [] for client_id in client_ids}
+        if not client_ids:
+            return order_ids
 
-        return clients, total
+        stmt = select(Order.client_id, Order.id)
+        stmt = stmt.where(Order.client_id.in_(client_ids)).order_by(Order.id)
+        for client_id, order_id in self.session.exec(stmt):
+            order_ids[client_id].append(order_id)
+        return order_ids
 
     def create(self, client_in: ClientCreate) -> Client:
         """Create a new client"""
         logger.debug(f"Creating client with phone: {client_in.phone}")
 
-        # Check for duplicate phone
-        stmt = select(Client.id).where(Client.phone == client_in.phone)
-        existing = self.session.exec(stmt).one_or_none()
-        if existing:
+        # Copy the set fields directly; the input is already validated and
+        # has no serializers, so a full model_dump() pass isn't needed
+        client = Client(**{
+            field: getattr(client_in, field)
+            for field in client_in.model_fields_set
+        })
+        self.session.add(client)
+
+        # The unique index on phone rejects duplicates atomically
+        try:
+            with keep_loaded(self.session):
+                self.session.commit()
+        except IntegrityError:
+            self.session.rollback()
             logger.warning(
                 f"Client with phone {client_in.phone} already exists")
             raise ConflictException("Client with such phone already exists")
 
-        client = Client(**client_in.model_dump(exclude_unset=True))
-        self.session.add(client)
-        self.session.commit()
-        self.session.refresh(client)
-
         logger.info(f"Client created successfully: {client.id}")
         return client
 
@@ -94,26 +122,23 @@ class ClientService:
             logger.warning("No data provided for update")
             raise BadRequestException("No data provided for update")
 
-    # Check if phone is being updated and if it already exists
-        if "phone" in update_data and update_data["phone"] != client.phone:
-            stmt = select(Client.id)
-            stmt = stmt.where(Client.phone == update_data["phone"])
-            stmt = stmt.where(Client.id != client.id)
-            existing = self.session.exec(stmt).first()
-            if existing:
-                logger.warning(
-                    f"Phone {update_data['phone']} already exists for another client"
-                )
-                raise ConflictException(
-                    f"Phone number {update_data['phone']} is already in use")
-
         for field, value in update_data.items():
             setattr(client, field, value)
 
         client.updated_at = datetime.now(timezone.utc)
         self.session.add(client)
-        self.session.commit()
-        self.session.refresh(client)
+
+        # The unique index on phone rejects duplicates atomically
+        try:
+            with keep_loaded(self.session):
+                self.session.commit()
+        except IntegrityError:
+            self.session.rollback()
+            logger.warning(
+                f"Phone {update_data['phone']} already exists for another client"
+            )
+            raise ConflictException(
+                f"Phone number {update_data['phone']} is already in use")
 
         logger.info(f"Client updated successfully: {client.id}")
         return client
@@ -122,17 +147,22 @@ class ClientService:
         """Delete client if no active orders exist"""
         logger.debug(f"Attempting to delete client: {client.id}")
 
-        if self.has_orders(client.id):
+        # Guard the DELETE itself, so the order check and the removal happen
+        # in one statement; the client is known to exist at this point
+        stmt = delete(Client).where(
+            Client.id == client.id,
+            ~exists().where(Order.client_id == client.id))
+        result = self.session.exec(stmt)
+        if not result.rowcount:
+            self.session.rollback()
             logger.warning(f"Cannot delete client {client.id}: has orders")
             raise BadRequestException(
                 "Cannot delete client: has active orders")
 
-        self.session.delete(client)
         self.session.commit()
         logger.info(f"Client deleted successfully: {client.id}")
 
     def has_orders(self, client_id: UUID) -> bool:
-        stmt = select(func.count()).select_from(Order)
-        stmt = stmt.where(Order.client_id == client_id)
-        count = self.session.exec(stmt).one()
-        return count > 0
+        """Check whether the client has any orders"""
+        stmt = select(exists().where(Order.client_id == client_id))
+        return self.session.exec(stmt).one()
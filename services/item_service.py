@@ -1,21 +1,25 @@
 from uuid import UUID
-from datetime import datetime, timezone, date
+from datetime import datetime, timezone
 from typing import List, Optional
-from sqlmodel import select, func
-from sqlalchemy.orm import selectinload
-from sqlalchemy import text
+from sqlmodel import select, func, exists
+from sqlalchemy import lambda_stmt
+from sqlalchemy.orm import selectinload, joinedload, raiseload
+from sqlalchemy.exc import IntegrityError
 
 # --- Project Imports ---
-from core.query_utils import apply_sorting
-from core.database import get_total_count, SessionDep
+from core.query_utils import apply_sorting, apply_keyset
+from core.cache import dropdown_cache, DROPDOWN_NAMESPACE
+from core.database import count_query, get_page_total, SessionDep
 from core.logger import logger
 from core.exceptions import ConflictException, BadRequestException
 from services.item_variant_service import ItemVariantService
-from models.order import Order
 from models.links import OrderItemLink
 from models.item import Item, ItemCreate, ItemUpdate, ItemFilters
 from models.item_variant import ItemVariantCreate, ItemVariantStatus, ItemVariant
 
+# Upper bound on values returned for a single dropdown
+MAX_DROPDOWN_OPTIONS = 1000
+
 
 class ItemService:
     """Handles all business logic and database operations for Items"""
@@ -30,15 +34,9 @@ class ItemService:
         # Always exclude archived items by default
         stmt = stmt.where(Item.is_archived == False)
 
-        # Join ItemVariant if any variant-specific filters are present
-        if any([filters.color, filters.size, filters.variant_status]):
-            stmt = stmt.join(ItemVariant, Item.id == ItemVariant.item_id)
-
         if filters.id:
-            if isinstance(filters.id, list):
-                stmt = stmt.where(Item.id.in_(filters.id))
-            else:
-                stmt = stmt.where(Item.id.contains(filters.id))
+            # Always a list of full UUIDs, so the primary key serves it
+            stmt = stmt.where(Item.id.in_(filters.id))
 
         if filters.title:
             stmt = stmt.where(Item.title.ilike(f"%{filters.title}%"))
@@ -51,20 +49,33 @@ class ItemService:
             stmt = stmt.where(Item.status == filters.status.value)
         if filters.tag:
             stmt = stmt.where(Item.tags.contains(filters.tag))
+
+        # Match variant filters with a semi-join rather than a join, so
+        # items never repeat and no DISTINCT is needed
+        variant_conditions = []
         if filters.color:
-            stmt = stmt.where(ItemVariant.color == filters.color)
+            variant_conditions.append(ItemVariant.color == filters.color)
         if filters.size:
-            stmt = stmt.where(ItemVariant.size == filters.size)
+            variant_conditions.append(ItemVariant.size == filters.size)
         if filters.variant_status:
-            stmt = stmt.where(ItemVariant.status == filters.variant_status)
-        return stmt.distinct()
+            variant_conditions.append(
+                ItemVariant.status == filters.variant_status)
+        if variant_conditions:
+            stmt = stmt.where(
+                exists().where(ItemVariant.item_id == Item.id,
+                               *variant_conditions))
+
+        return stmt
 
     def get_items(self,
                   filters: ItemFilters,
                   offset: int = 0,
                   limit: int = 100,
                   sort_field: str = "id",
-                  sort_order: str = "DESC") -> tuple[List[Item], int]:
+                  sort_order: str = "DESC",
+                  after: Optional[UUID] = None,
+                  count: bool = True
+                  ) -> tuple[List[Item], Optional[int], bool]:
         """
         Get filtered and paginated items with total count
 
@@ -74,25 +85,99 @@ class ItemService:
             limit: Maximum number of records to return
             sort_field: Field to sort by
             sort_order: Sort direction (ASC or DESC)
+            after: ID of the last item of the previous page; when given,
+                the page starts right after it and `offset` is ignored
+            count: Whether to count the filtered items
 
         Returns:
-            Tuple of (list of items, total count)
+            Tuple of (list of items, total count, whether more items follow);
+            the total is None for cursor pages and when `count` is off
         """
         logger.debug("Fetching items with filters")
 
-        stmt = select(Item)
+        # Cursor pages have no position to report a total against
+        count = count and after is None
+
+        # Rows of a counted page carry the total of the filtered set, so the
+        # page and the count come back from one query
+        columns = [Item]
+        if count:
+            columns.append(func.count().over().label("total"))
+
+        stmt = select(*columns)
         stmt = self._apply_filters(stmt, filters)
         stmt = apply_sorting(stmt, Item, sort_field, sort_order)
 
-        # Get total count before pagination
-        total = get_total_count(self.session, stmt)
-
-        # Apply pagination
-        stmt = stmt.offset(offset).limit(limit)
-        items = self.session.exec(stmt).all()
+        # Load the variants and prices serialized for each item in batched
+        # queries instead of lazily per item. Any other relationship would
+        # be loaded once per row, so touching one raises instead
+        page_stmt = stmt.options(
+            selectinload(Item.variants).selectinload(ItemVariant.prices),
+            selectinload(Item.variants).raiseload("*"), raiseload("*"))
+
+        if not count:
+            if after is not None:
+                # Seek past the previous page instead of scanning an offset
+                page_stmt = self._apply_cursor(page_stmt, sort_field,
+                                               sort_order, after)
+            else:
+                page_stmt = page_stmt.offset(offset)
+            # One extra row tells whether another page follows, so the
+            # filtered set is never counted
+            items = self.session.exec(page_stmt.limit(limit + 1)).all()
+            has_more = len(items) > limit
+            logger.debug(f"Found {len(items[:limit])} items, not counted")
+            return items[:limit], None, has_more
+
+        rows = self.session.exec(page_stmt.offset(offset).limit(limit)).all()
+        items = [item for item, _ in rows]
+        if rows:
+            total = rows[0].total
+        else:
+            # An empty page past the end has no row to read the total from
+            count_stmt = count_query(
+                self._apply_filters(select(Item), filters))
+            total = get_page_total(self.session, count_stmt, offset, limit, 0)
 
         logger.debug(f"Found {len(items)} items out of {total} total")
-        return items, total
+        return items, total, offset + len(items) < total
+
+    def _apply_cursor(self, stmt, sort_field: str, sort_order: str,
+                      after: UUID):
+        """Restricts the item query to the rows after the cursor item"""
+        sort_column = getattr(Item, sort_field, None)
+        if sort_column is None:
+            raise BadRequestException(f"Cannot sort by '{sort_field}'")
+
+        if sort_column is Item.id:
+            # The cursor is the sort value itself
+            return apply_keyset(stmt, Item.id, Item.id, sort_order, after,
+                                after)
+
+        row = self.session.exec(
+            select(Item.id, sort_column).where(Item.id == after)).first()
+        if row is None:
+            raise BadRequestException(f"Invalid cursor: {after}")
+        return apply_keyset(stmt, sort_column, Item.id, sort_order, row[1],
+                            after)
+
+    def get_order_ids(self, item_ids: List[UUID]) -> dict[UUID, List[int]]:
+        """Map each item ID to the IDs of orders booking its variants"""
+        order_ids = {item_id: [] for item_id in item_ids}
+        if not item_ids:
+            return order_ids
+
+        # Runs for every item response with the same shape, so build it as a
+        # lambda statement and let SQLAlchemy cache the construct
+        stmt = lambda_stmt(lambda: select(
+            ItemVariant.item_id, OrderItemLink.order_id).join(
+                OrderItemLink,
+                OrderItemLink.item_variant_id == ItemVariant.id).where(
+                    ItemVariant.item_id.in_(item_ids)).distinct().order_by(
+                        OrderItemLink.order_id))
+        for item_id, order_id in self.session.exec(stmt):
+            order_ids[item_id].append(order_id)
+        return order_ids
 
     def get_by_id(self, item_id: UUID) -> Optional[Item]:
         """
@@ -105,7 +190,12 @@ class ItemService:
             Item or None if not found
         """
         logger.debug(f"Fetching item by ID: {item_id}")
-        return self.session.get(Item, item_id)
+        # A single parent row, so join in the variants and prices the
+        # endpoints serialize rather than loading them in later queries
+        return self.session.get(
+            Item,
+            item_id,
+            options=[joinedload(Item.variants).joinedload(ItemVariant.prices)])
 
     def create(self, item_in: ItemCreate) -> Item:
         """
@@ -122,31 +212,52 @@ class ItemService:
         """
         logger.debug(f"Creating item with title: {item_in.title}")
 
-        # Check for duplicate title
-        stmt = select(Item.id).where(Item.title == item_in.title)
-        existing = self.session.exec(stmt).first()
-        if existing:
-            logger.warning(f"Item with title '{item_in.title}' already exists")
-            raise ConflictException("Item with this title already exists")
-
         # Create item
         item_data = item_in.model_dump(exclude={"variants"})
         item = Item(**item_data)
         self.session.add(item)
-        self.session.flush()
 
-        # Create variants if provided
+        # The unique index on title rejects duplicates atomically
+        try:
+            self.session.flush()
+        except IntegrityError:
+            self.session.rollback()
+            logger.warning(f"Item with title '{item_in.title}' already exists")
+            raise ConflictException("Item with this title already exists")
+
+        # Create variants if provided. They are flushed together, so the
+        # variants and their prices go out as batched INSERTs in one commit
         if item_in.variants:
-            for variant_in in item_in.variants:
-                variant_create = ItemVariantCreate(**variant_in.model_dump(),
-                                                   item_id=item.id)
-                self.variant_service.create(variant_create)
+            self.session.add_all([
+                self.variant_service.build(
+                    ItemVariantCreate(**variant_in.model_dump(),
+                                      item_id=item.id))
+                for variant_in in item_in.variants
+            ])
 
         self.session.commit()
-        self.session.refresh(item)
+        dropdown_cache.invalidate(DROPDOWN_NAMESPACE)
 
         logger.info(f"Item created successfully: {item.id}")
-        return item
+        return self._reload(item)
+
+    def _reload(self, item: Item) -> Item:
+        """
+        Reload a saved item with its variants and prices in batched queries,
+        rather than refreshing it and lazily loading each variant's prices
+        """
+        stmt = select(Item).where(Item.id == item.id).options(
+            selectinload(Item.variants).selectinload(ItemVariant.prices))
+        stmt = stmt.execution_options(populate_existing=True)
+        return self.session.exec(stmt).one()
+
+    @staticmethod
+    def _variant_key(variant) -> tuple:
+        """Hashable snapshot of a variant's columns and prices"""
+        return (variant.size, variant.color, variant.status,
+                variant.quantity, variant.service_start_time,
+                variant.service_end_time,
+                ItemVariantService.price_key(variant.prices))
 
     def update(self, item: Item, item_in: ItemUpdate) -> Item:
         """
@@ -172,31 +283,47 @@ class ItemService:
             logger.warning("No data provided for update")
             raise BadRequestException("No data provided for update")
 
-        # Check if title is being updated and if it already exists
-        title = update_data.get("title", None)
-        if title and title != item.title:
-            stmt = select(Item.id)
-            stmt = stmt.where(Item.title == title, Item.id != item.id)
-            existing = self.session.exec(stmt).first()
-            if existing:
-                logger.warning(f"Title '{title}' already exists")
-                raise ConflictException(f"Title '{title}' is already in use")
-
         # Update item fields
+        title_changed = update_data.get("title", item.title) != item.title
         for field, value in update_data.items():
             setattr(item, field, value)
 
+        # The unique index on title rejects duplicates atomically, so write
+        # a new title before any variant changes are committed
+        if title_changed:
+            try:
+                self.session.flush()
+            except IntegrityError:
+                self.session.rollback()
+                title = update_data["title"]
+                logger.warning(f"Title '{title}' already exists")
+                raise ConflictException(f"Title '{title}' is already in use")
+
         existing_variants_map = {v.id: v for v in item.variants}
         processed_variant_ids = set()
 
+        # Stored variants keyed by their contents, so a variant submitted
+        # again unchanged is kept rather than deleted and recreated
+        unchanged_variants = {}
+        for variant in item.variants:
+            if not variant.is_archived:
+                unchanged_variants.setdefault(self._variant_key(variant),
+                                              []).append(variant.id)
+
         for variant_in in item_in.variants:
 
             # New variant (no ID)
             if not hasattr(variant_in, 'id') or not variant_in.id:
+                # Saved with the item's commit, batched with other new ones
                 variant_create = ItemVariantCreate(
                     item_id=item.id,
                     **variant_in.model_dump(exclude_unset=True))
-                self.variant_service.create(variant_create)
+                matches = unchanged_variants.get(
+                    self._variant_key(variant_create))
+                if matches:
+                    processed_variant_ids.add(matches.pop())
+                    continue
+                self.session.add(self.variant_service.build(variant_create))
                 continue
 
             # Update existing variant
@@ -208,20 +335,31 @@ class ItemService:
             else:
                 logger.warning(f"Variant {variant_in.id} not found, skipping")
 
-        # Delete variants not in the update list
-        to_delete = set(existing_variants_map.keys()) - processed_variant_ids
-        for variant_id in to_delete:
-            logger.debug(f"Deleting variant {variant_id} (not in update list)")
-            self.variant_service.delete(existing_variants_map[variant_id])
+        # Remove variants not in the update list with the item's commit; one
+        # query finds those with orders, which are archived instead
+        to_remove = existing_variants_map.keys() - processed_variant_ids
+        if to_remove:
+            stmt = select(OrderItemLink.item_variant_id).where(
+                OrderItemLink.item_variant_id.in_(to_remove)).distinct()
+            booked_ids = set(self.session.exec(stmt).all())
+            for variant_id in to_remove:
+                variant = existing_variants_map[variant_id]
+                if variant_id in booked_ids:
+                    logger.debug(f"Archiving variant {variant_id} (has orders)")
+                    variant.is_archived = True
+                else:
+                    logger.debug(
+                        f"Deleting variant {variant_id} (not in update list)")
+                    self.session.delete(variant)
 
         item.updated_at = datetime.now(timezone.utc)
 
         self.session.add(item)
         self.session.commit()
-        self.session.refresh(item)
+        dropdown_cache.invalidate(DROPDOWN_NAMESPACE)
 
         logger.info(f"Item updated successfully: {item.id}")
-        return item
+        return self._reload(item)
 
     def delete(self, item: Item) -> None:
         """
@@ -232,21 +370,25 @@ class ItemService:
         """
         logger.debug(f"Attempting to delete item: {item.id}")
 
-        # Check for active orders
-        for variant in item.variants:
-            if variant.order_links:
-                item.is_archived = True
-                item.updated_at = datetime.now(timezone.utc)
+        # Check for orders with a single EXISTS, which stops at the first
+        # link, instead of loading the links of every variant
+        stmt = select(
+            exists().where(OrderItemLink.item_variant_id == ItemVariant.id,
+                           ItemVariant.item_id == item.id))
+        if self.session.exec(stmt).one():
+            item.is_archived = True
+            item.updated_at = datetime.now(timezone.utc)
 
-                self.session.add(item)
-                self.session.commit()
+            self.session.add(item)
+            self.session.commit()
 
-                logger.info(f"Order {item.id} archived successfully")
-                return
+            logger.info(f"Order {item.id} archived successfully")
+            return
 
         # Safe to delete
         self.session.delete(item)
         self.session.commit()
+        dropdown_cache.invalidate(DROPDOWN_NAMESPACE)
 
         logger.info(f"Item deleted successfully: {item.id}")
 
@@ -262,10 +404,18 @@ class ItemService:
         logger.debug(f"Checking availability for item {item.id} "
                      f"from {start_time} to {end_time}")
 
+        # Look up booking conflicts for every variant at once
+        conflicts = self.variant_service.get_booking_conflicts(
+            [variant.id for variant in item.variants], start_time, end_time,
+            exclude_order_id)
+
         # Update variant availability status
         for variant in item.variants:
-            is_available, reason = self.variant_service.check_availability(
-                variant, start_time, end_time, exclude_order_id)
+            is_available, reason = self.variant_service.check_state(
+                variant, start_time, exclude_order_id)
+            if is_available:
+                is_available, reason = self.variant_service.check_conflicts(
+                    variant, conflicts)
 
             if not is_available:
                 logger.debug(reason)
@@ -286,16 +436,23 @@ class ItemService:
         Returns:
             Sorted list of distinct values
         """
+        # Options change rarely, so serve them from the cache until a write
+        values = dropdown_cache.get_or_set(
+            DROPDOWN_NAMESPACE, (model.__name__, field_name),
+            lambda: self._fetch_distinct_field_values(model, field_name))
+        return list(values)
+
+    def _fetch_distinct_field_values(self, model: type,
+                                     field_name: str) -> tuple:
+        """Query the sorted distinct non-null values of a field"""
         logger.debug(
             f"Fetching distinct {field_name} values from {model.__name__}")
 
+        # Sort and cap in SQL; only the single column is fetched
         field_attr = getattr(model, field_name)
         stmt = select(field_attr).where(field_attr.is_not(None)).distinct()
-        results = self.session.exec(stmt).all()
+        stmt = stmt.order_by(field_attr).limit(MAX_DROPDOWN_OPTIONS)
+        results = tuple(self.session.exec(stmt).all())
 
-        # Filter out None and convert to strings
-        filtered_results = [result for result in results if result is not None]
-
-        logger.debug(
-            f"Retrieved {len(filtered_results)} distinct {field_name} values")
-        return sorted(filtered_results)
+        logger.debug(f"Retrieved {len(results)} distinct {field_name} values")
+        return results
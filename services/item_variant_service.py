@@ -1,7 +1,9 @@
 from uuid import UUID
+from collections import Counter
 from typing import List, Optional
-from sqlmodel import Session, select
-from datetime import datetime
+from sqlmodel import Session, select, func, update, exists
+from sqlalchemy import lambda_stmt
+from datetime import datetime, timezone
 
 from core.logger import logger
 from models.item_variant import (ItemVariant, ItemVariantFilters,
@@ -9,14 +11,19 @@ from models.item_variant import (ItemVariant, ItemVariantFilters,
                                  ItemVariantCreate, ItemVariantPrice)
 from models.links import OrderItemLink
 from models.order import Order
-from core.exceptions import NotFoundException, BadRequestException
-from core.query_utils import apply_sorting
-from core.database import get_total_count
+from core.query_utils import apply_sorting, sort_columns
+from core.cache import dropdown_cache, DROPDOWN_NAMESPACE
+from core.database import count_query, get_page_total, keep_loaded
 
 
 class ItemVariantService:
     """Business logic for item variant operations"""
 
+    # Columns variants may be sorted by
+    SORT_COLUMNS = sort_columns(ItemVariant, (
+        "id", "item_id", "size", "color", "quantity", "status",
+        "service_start_time", "service_end_time", "created_at", "updated_at"))
+
     def __init__(self, session: Session):
         self.session = session
 
@@ -43,7 +50,8 @@ class ItemVariantService:
             stmt = stmt.where(
                 ItemVariant.service_start_time == filters.service_start_time)
 
-        return stmt.distinct()
+        # Filters only touch ItemVariant columns, so rows can't repeat
+        return stmt
 
     def get_variants(self,
                      filters: ItemVariantFilters,
@@ -54,16 +62,22 @@ class ItemVariantService:
         """Get filtered and paginated variants with total count"""
         logger.debug("Fetching variants")
 
-        stmt = select(ItemVariant)
+        # Each row carries the total of the filtered set, so the page and the
+        # count come back from a single query
+        stmt = select(ItemVariant, func.count().over().label("total"))
         stmt = self._apply_filters(stmt, filters)
-        stmt = apply_sorting(stmt, ItemVariant, sort_field, sort_order)
-
-        # Get total count before pagination
-        total = get_total_count(self.session, stmt)
-
-        # Apply pagination
-        stmt = stmt.offset(offset).limit(limit)
-        variants = self.session.exec(stmt).all()
+        stmt = apply_sorting(stmt, ItemVariant, sort_field, sort_order,
+                             self.SORT_COLUMNS)
+
+        rows = self.session.exec(stmt.offset(offset).limit(limit)).all()
+        variants = [variant for variant, _ in rows]
+        if rows:
+            total = rows[0].total
+        else:
+            # An empty page past the end has no row to read the total from
+            count_stmt = count_query(
+                self._apply_filters(select(ItemVariant), filters))
+            total = get_page_total(self.session, count_stmt, offset, limit, 0)
 
         logger.debug(f"Found {len(variants)} variants out of {total} total")
         return variants, total
@@ -72,10 +86,8 @@ class ItemVariantService:
         logger.debug(f"Fetching variant by ID: {variant_id}")
         return self.session.get(ItemVariant, variant_id)
 
-    def create(self, variant_in: ItemVariantCreate) -> ItemVariant:
-        """Create a new item variant"""
-        logger.debug(f"Creating new variant for item {variant_in.item_id}")
-
+    def build(self, variant_in: ItemVariantCreate) -> ItemVariant:
+        """Build a variant with its prices without adding it to the session"""
         # Extract variant data
         variant_data = variant_in.model_dump(exclude={"prices"})
 
@@ -88,11 +100,17 @@ class ItemVariantService:
             ]
 
         # Create variant with prices
-        variant = ItemVariant(**variant_data, prices=prices)
+        return ItemVariant(**variant_data, prices=prices)
+
+    def create(self, variant_in: ItemVariantCreate) -> ItemVariant:
+        """Create a new item variant"""
+        logger.debug(f"Creating new variant for item {variant_in.item_id}")
 
+        variant = self.build(variant_in)
         self.session.add(variant)
-        self.session.commit()
-        self.session.refresh(variant)
+        with keep_loaded(self.session):
+            self.session.commit()
+        dropdown_cache.invalidate(DROPDOWN_NAMESPACE)
 
         logger.info(f"Item variant created successfully: {variant.id}")
         return variant
@@ -101,7 +119,10 @@ class ItemVariantService:
         """Delete variant or archive if it has orders"""
         logger.debug(f"Attempting to delete variant: {variant.id}")
 
-        if variant.order_links and len(variant.order_links) > 0:
+        # A single EXISTS stops at the first link instead of loading them all
+        stmt = select(
+            exists().where(OrderItemLink.item_variant_id == variant.id))
+        if self.session.exec(stmt).one():
             logger.info(f"Variant {variant.id} has linked orders. "
                         "Archiving instead of deleting")
 
@@ -114,35 +135,61 @@ class ItemVariantService:
         # No orders - safe to delete
         self.session.delete(variant)
         self.session.commit()
+        dropdown_cache.invalidate(DROPDOWN_NAMESPACE)
         logger.info(f"Variant {variant.id} deleted successfully")
 
+    @staticmethod
+    def price_key(prices) -> frozenset:
+        """Hashable snapshot of a variant's prices, ignoring their order"""
+        return frozenset(
+            Counter((price.price_type, price.amount, price.deposit)
+                    for price in prices or ()).items())
+
     def update(self, variant: ItemVariant,
                variant_in: ItemVariantUpdate) -> ItemVariant:
         """Update existing item variant and its prices"""
         logger.debug(f"Updating variant: {variant.id}")
 
-        # # Extract update data
-        update_data = variant_in.model_dump(exclude={"prices"},
-                                            exclude_unset=True)
-
-        # Update variant fields
-        for field, value in update_data.items():
-            setattr(variant, field, value)
+        # Only the fields the client sent that differ from the stored row
+        update_data = {
+            field: getattr(variant_in, field)
+            for field in variant_in.model_fields_set - {"prices"}
+            if getattr(variant_in, field) != getattr(variant, field)
+        }
 
-        # Update prices if provided
-        if variant_in.prices is not None:
+        # Clear service dates if status is set to available
+        status = update_data.get("status", variant.status)
+        if status == ItemVariantStatus.AVAILABLE:
+            for field in ("service_start_time", "service_end_time"):
+                update_data.pop(field, None)
+                if getattr(variant, field) is not None:
+                    update_data[field] = None
+
+        prices_changed = variant_in.prices is not None and (
+            self.price_key(variant_in.prices) != self.price_key(
+                variant.prices))
+
+        if not update_data and not prices_changed:
+            logger.debug(f"Variant {variant.id} unchanged, skipping update")
+            return variant
+
+        # Write the columns with a single UPDATE; the session's copy of the
+        # variant is synchronized in place instead of tracked per attribute
+        if update_data:
+            update_data["updated_at"] = datetime.now(timezone.utc)
+            stmt = update(ItemVariant).where(ItemVariant.id == variant.id)
+            self.session.exec(stmt.values(**update_data))
+
+        # Replace prices only when they differ
+        if prices_changed:
             variant.prices = [
                 ItemVariantPrice(**p.model_dump()) for p in variant_in.prices
             ]
+            self.session.add(variant)
 
-        # Clear service dates if status is set to available
-        if variant.status == ItemVariantStatus.AVAILABLE:
-            variant.service_start_time = None
-            variant.service_end_time = None
-
-        self.session.add(variant)
-        self.session.commit()
-        self.session.refresh(variant)
+        with keep_loaded(self.session):
+            self.session.commit()
+        dropdown_cache.invalidate(DROPDOWN_NAMESPACE)
 
         logger.info(f"Variant updated successfully: {variant.id}")
         return variant
@@ -208,6 +255,22 @@ class ItemVariantService:
             exclude_order_id: Optional[int] = None
     ) -> tuple[bool, Optional[str]]:
         """Validate item variant availability for the given time period"""
+        is_available, reason = self.check_state(variant, start_time,
+                                                exclude_order_id)
+        if not is_available:
+            return is_available, reason
+
+        conflicts = self.get_booking_conflicts([variant.id], start_time,
+                                               end_time, exclude_order_id)
+        return self.check_conflicts(variant, conflicts)
+
+    def check_state(
+            self,
+            variant: ItemVariant,
+            start_time: datetime,
+            exclude_order_id: Optional[int] = None
+    ) -> tuple[bool, Optional[str]]:
+        """Validate the variant's own archive and maintenance state"""
 
         # Check if variant is archived
         if variant.is_archived and exclude_order_id == None:
@@ -217,20 +280,44 @@ class ItemVariantService:
         if variant.service_end_time and variant.service_end_time > start_time:
             return False, f"Variant {variant.id} under maintenance until {variant.service_end_time}"
 
-        # Check for booking conflicts
-        stmt = select(OrderItemLink.order_id).join(Order)
-        stmt = stmt.where(
-            OrderItemLink.item_variant_id == variant.id,
-            Order.status.in_(["booked", "issued"]),
-            Order.is_archived == False,
-            Order.start_time <= end_time,
-            Order.end_time >= start_time,
-        )
-        # Exclude current order when updating
-        if exclude_order_id:
-            stmt = stmt.where(Order.id != exclude_order_id)
-        order_id = self.session.exec(stmt).first()
+        return True, None
+
+    def check_conflicts(self, variant: ItemVariant,
+                        conflicts: dict[UUID, int]
+                        ) -> tuple[bool, Optional[str]]:
+        """Validate the variant against prefetched booking conflicts"""
+        order_id = conflicts.get(variant.id)
         if order_id:
             return False, f"Variant {variant.id} already booked during this period by {order_id}"
 
         return True, None
+
+    def get_booking_conflicts(
+            self,
+            variant_ids: List[UUID],
+            start_time: datetime,
+            end_time: datetime,
+            exclude_order_id: Optional[int] = None) -> dict[UUID, int]:
+        """
+        Map each variant booked during the period to a conflicting order ID,
+        checking all the variants with a single query.
+        """
+        if not variant_ids:
+            return {}
+
+        # Built as a lambda statement so SQLAlchemy caches the compiled query
+        stmt = lambda_stmt(lambda: select(
+            OrderItemLink.item_variant_id, func.min(Order.id)).join(
+                Order).where(
+                    OrderItemLink.item_variant_id.in_(variant_ids),
+                    Order.status.in_(["booked", "issued"]),
+                    Order.is_archived == False,
+                    Order.start_time <= end_time,
+                    Order.end_time >= start_time,
+                ))
+        # Exclude current order when updating
+        if exclude_order_id:
+            stmt += lambda s: s.where(Order.id != exclude_order_id)
+        stmt += lambda s: s.group_by(OrderItemLink.item_variant_id)
+
+        return dict(self.session.exec(stmt).all())
@@ -1,13 +1,14 @@
 from uuid import UUID
 from datetime import datetime, timezone, date
-from typing import List, Optional
+from typing import List, Optional, Set
 from sqlmodel import select, func
+from sqlalchemy.orm import selectinload, lazyload
 from sqlalchemy.sql.expression import Select
 
 # --- Project Imports ---
 from core.logger import logger
 from core.query_utils import apply_sorting
-from core.database import get_total_count
+from core.database import count_query, get_page_total
 from core.exceptions import ConflictException, BadRequestException
 from models.client import Client
 from models.payment import Payment
@@ -19,6 +20,17 @@ from models.order import Order, OrderCreate, OrderUpdate, OrderFilters
 class OrderService:
     """Business logic for order operations"""
 
+    # Relationships serialized in order responses; collections come in one
+    # batched query per page and the variant and item rows are joined in.
+    # Variant prices aren't part of an order response, so they stay lazy
+    LOAD_OPTIONS = (
+        selectinload(Order.item_links).joinedload(
+            OrderItemLink.item_variant).joinedload(ItemVariant.item),
+        selectinload(Order.item_links).joinedload(
+            OrderItemLink.item_variant).lazyload(ItemVariant.prices),
+        selectinload(Order.payments),
+    )
+
     def __init__(self, session):
         self.session = session
 
@@ -107,12 +119,12 @@ class OrderService:
         stmt = self._apply_filters(stmt, filters)
         stmt = apply_sorting(stmt, Order, sort_field, sort_order)
 
-        # Get total count before pagination
-        total = get_total_count(self.session, stmt)
-
-        # Apply pagination
-        stmt = stmt.offset(offset).limit(limit)
-        orders = self.session.exec(stmt).all()
+        # Apply pagination, counting only when the page can't tell the total
+        page_stmt = stmt.options(*self.LOAD_OPTIONS)
+        orders = self.session.exec(
+            page_stmt.offset(offset).limit(limit)).all()
+        total = get_page_total(self.session, count_query(stmt), offset,
+                               limit, len(orders))
 
         logger.debug(f"Found {len(orders)} orders out of {total} total")
         return orders, total
@@ -120,18 +132,50 @@ class OrderService:
     def get_by_id(self, order_id: int) -> Optional[Order]:
         """Get order by ID"""
         logger.debug(f"Fetching order by ID: {order_id}")
-        return self.session.get(Order, order_id)
+        return self.session.get(Order, order_id, options=self.LOAD_OPTIONS)
+
+    def _reload(self, order: Order) -> Order:
+        """
+        Reload a saved order with its links and payments in batched queries,
+        rather than refreshing it and lazily loading each link's variant
+        """
+        stmt = select(Order).where(Order.id == order.id).options(
+            *self.LOAD_OPTIONS)
+        stmt = stmt.execution_options(populate_existing=True)
+        return self.session.exec(stmt).one()
+
+    def get_booked_variant_ids(
+            self,
+            variant_ids: List[UUID],
+            start_time: date,
+            end_time: date,
+            exclude_order_id: Optional[int] = None) -> Set[UUID]:
+        """Get the variants booked during the period, using a single query"""
+        stmt = select(OrderItemLink.item_variant_id).join(Order)
+        stmt = stmt.where(
+            OrderItemLink.item_variant_id.in_(variant_ids),
+            Order.status.in_(["booked", "issued"]),
+            Order.is_archived == False,
+            Order.start_time <= end_time,
+            Order.end_time >= start_time,
+        )
+
+        # Exclude current order when updating
+        if exclude_order_id:
+            stmt = stmt.where(Order.id != exclude_order_id)
+
+        # A set keeps the per-variant membership checks constant time
+        return set(self.session.exec(stmt.distinct()).all())
 
     def check_variant_availability(
             self,
             variant_id: UUID,
+            variant: Optional[ItemVariant],
             start_time: date,
-            end_time: date,
+            booked_variant_ids: Set[UUID],
             exclude_order_id: Optional[int] = None
     ) -> tuple[bool, Optional[str]]:
-        """Check if variant is available for booking period"""
-        # Get variant
-        variant: ItemVariant = self.session.get(ItemVariant, variant_id)
+        """Check if a prefetched variant is available for booking period"""
         if not variant:
             return False, f"Variant {variant_id} not found"
 
@@ -144,20 +188,7 @@ class OrderService:
             return False, f"Variant {variant_id} under maintenance until {variant.service_end_time}"
 
         # Check for booking conflicts
-        stmt = select(OrderItemLink.item_variant_id).join(Order)
-        stmt = stmt.where(
-            OrderItemLink.item_variant_id == variant_id,
-            Order.status.in_(["booked", "issued"]),
-            Order.is_archived == False,
-            Order.start_time <= end_time,
-            Order.end_time >= start_time,
-        )
-
-        # Exclude current order when updating
-        if exclude_order_id:
-            stmt = stmt.where(Order.id != exclude_order_id)
-
-        if self.session.exec(stmt).first():
+        if variant_id in booked_variant_ids:
             return False, f"Variant {variant_id} already booked during this period"
 
         return True, None
@@ -171,13 +202,26 @@ class OrderService:
         if not items:
             raise BadRequestException("Order must contain at least one item")
 
+        # Load the variants and their bookings for all items at once rather
+        # than querying per item
+        variant_ids = [item.item_variant_id for item in items]
+        stmt = select(ItemVariant).where(ItemVariant.id.in_(variant_ids))
+        stmt = stmt.options(lazyload(ItemVariant.prices))
+        variants = {
+            variant.id: variant
+            for variant in self.session.exec(stmt).all()
+        }
+        booked_variant_ids = self.get_booked_variant_ids(
+            variant_ids, start_time, end_time, exclude_order_id)
+
         unavailable_variants = []
 
-        for item in items:
+        for variant_id in variant_ids:
             is_available, reason = self.check_variant_availability(
-                variant_id=item.item_variant_id,
+                variant_id=variant_id,
+                variant=variants.get(variant_id),
                 start_time=start_time,
-                end_time=end_time,
+                booked_variant_ids=booked_variant_ids,
                 exclude_order_id=exclude_order_id)
 
             if not is_available:
@@ -225,10 +269,9 @@ class OrderService:
 
         self.session.add(order)
         self.session.commit()
-        self.session.refresh(order)
 
         logger.info(f"Order {order.id} created successfully")
-        return order
+        return self._reload(order)
 
     def update(self, order: Order, order_in: OrderUpdate) -> Order:
         """Update existing order"""
@@ -284,10 +327,9 @@ class OrderService:
         order.updated_at = datetime.now(timezone.utc)
         self.session.add(order)
         self.session.commit()
-        self.session.refresh(order)
 
         logger.info(f"Order {order.id} updated successfully")
-        return order
+        return self._reload(order)
 
     def archive(self, order: Order) -> None:
         """Archive an order (soft delete)"""
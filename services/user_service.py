@@ -7,7 +7,7 @@ from core.query_utils import apply_sorting
 from core.logger import logger
 from core.exceptions import ConflictException
 from models.user import User, UserCreate, UserFilters
-from core.database import SessionDep, get_total_count, create_user, get_user_by_username, get_user_by_email
+from core.database import SessionDep, count_query, get_page_total, create_user, get_user_by_username, get_user_by_email
 
 
 class UserService:
@@ -19,10 +19,8 @@ class UserService:
     def _apply_filters(self, stmt, filters: UserFilters):
         """Apply user filters to the query statement"""
         if filters.id:
-            if isinstance(filters.id, list):
-                stmt = stmt.where(User.id.in_(filters.id))
-            else:
-                stmt = stmt.where(User.id.contains(filters.id))
+            # Always a list of full UUIDs, so the primary key serves it
+            stmt = stmt.where(User.id.in_(filters.id))
 
         if filters.is_external is not None:
             stmt = stmt.where(User.is_external == filters.is_external)
@@ -53,11 +51,9 @@ class UserService:
         stmt = self._apply_filters(stmt, filters)
         stmt = apply_sorting(stmt, User, sort_field, sort_order)
 
-        # Get total count before pagination
-        total = get_total_count(self.session, stmt)
-
-        stmt = stmt.offset(offset).limit(limit)
-        users = self.session.exec(stmt).all()
+        users = self.session.exec(stmt.offset(offset).limit(limit)).all()
+        total = get_page_total(self.session, count_query(stmt), offset,
+                               limit, len(users))
 
         return users, total
 
@@ -0,0 +1,7 @@
+import os
+import tempfile
+
+# Point the app at a throwaway database before its settings are loaded
+_TMP_DIR = tempfile.mkdtemp()
+os.environ["SQLITE_FILE"] = os.path.join(_TMP_DIR, "test.db")
+os.environ["UPLOAD_DIR"] = os.path.join(_TMP_DIR, "images")
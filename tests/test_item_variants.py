@@ -0,0 +1,28 @@
+from datetime import date
+from uuid import uuid4
+
+from sqlmodel import Session, select
+
+# --- Project Imports ---
+from core.database import engine
+from models.item_variant import (ItemVariant, ItemVariantFilters,
+                                 ItemVariantStatus)
+from services.item_variant_service import ItemVariantService
+
+
+def test_variant_filters_skip_distinct():
+    """Variant filters stay on one table, so the query has no DISTINCT"""
+    filters = ItemVariantFilters(id=[uuid4()],
+                                 item_id=[uuid4()],
+                                 size="M",
+                                 color="Red",
+                                 status=[ItemVariantStatus.AVAILABLE],
+                                 service_start_time=date(2024, 1, 1),
+                                 service_end_time=date(2024, 1, 2))
+
+    with Session(engine) as session:
+        stmt = ItemVariantService(session)._apply_filters(
+            select(ItemVariant), filters)
+
+    sql = str(stmt.compile(dialect=engine.dialect))
+    assert "DISTINCT" not in sql.upper()
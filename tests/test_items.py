@@ -0,0 +1,178 @@
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import InvalidRequestError
+from sqlmodel import Session
+from fastapi.testclient import TestClient
+
+# --- Project Imports ---
+import main
+from core.database import engine
+from core.dependencies import get_current_user
+from models.item import ItemFilters
+from models.user import User
+from services.item_service import ItemService
+
+
+@pytest.fixture(scope="module")
+def client():
+    main.app.dependency_overrides[get_current_user] = lambda: User(
+        username="test", email="test@example.com", hashed_password="x")
+    with TestClient(main.app) as test_client:
+        for title in ("A", "B"):
+            response = test_client.post("/api/v1/items",
+                                        json={
+                                            "title": title,
+                                            "variants": [{
+                                                "size": "M"
+                                            }]
+                                        })
+            assert response.status_code == 201
+        yield test_client
+    main.app.dependency_overrides.clear()
+
+
+@contextmanager
+def count_queries():
+    """Collects the SQL statements executed inside the block"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.mark.parametrize("count", ["true", "false"])
+def test_list_items_empty_range(client, count):
+    """A zero-size range returns an empty page without a next cursor"""
+    response = client.get("/api/v1/items",
+                          params={
+                              "range": "[0,-1]",
+                              "count": count
+                          })
+
+    assert response.status_code == 200
+    assert response.json() == []
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_list_items_title_filter_matches_substring(client):
+    """The title filter matches anywhere in the title, ignoring case"""
+    response = client.post("/api/v1/items", json={"title": "Dress"})
+    assert response.status_code == 201
+
+    for title in ("ress", "DRESS"):
+        response = client.get("/api/v1/items",
+                              params={"filter": f'{{"title":"{title}"}}'})
+
+        assert response.status_code == 200
+        assert [item["title"] for item in response.json()] == ["Dress"]
+
+
+
+@pytest.mark.parametrize("count", ["true", "false"])
+def test_list_items_query_count(client, count):
+    """A page of items takes the same number of queries whatever its size"""
+    for n in range(5):
+        response = client.post("/api/v1/items",
+                               json={
+                                   "title": f"Counted {n}",
+                                   "variants": [{
+                                       "size": "S"
+                                   }, {
+                                       "size": "L"
+                                   }]
+                               })
+        assert response.status_code in (201, 409)
+
+    query_counts = []
+    for page_range in ("[0,0]", "[0,4]"):
+        with count_queries() as statements:
+            # Only the items above, so every item on the page has variants
+            response = client.get("/api/v1/items",
+                                  params={
+                                      "filter": '{"title":"Counted"}',
+                                      "range": page_range,
+                                      "count": count
+                                  })
+        assert response.status_code == 200
+        query_counts.append(len(statements))
+
+    # The page, its variants, their prices and the order IDs
+    assert query_counts == [4, 4]
+
+
+@pytest.mark.parametrize("variant_filter", [
+    '{"color":"Teal"}', '{"size":"XXL"}', '{"variant_status":"repair"}',
+    '{"color":"Teal","size":"XXL","variant_status":"repair"}'
+])
+def test_list_items_variant_filters_return_item_once(client, variant_filter):
+    """An item with several matching variants is listed once"""
+    variant = {"size": "XXL", "color": "Teal", "status": "repair"}
+    response = client.post("/api/v1/items",
+                           json={
+                               "title": "Multi variant",
+                               "variants": [
+                                   dict(variant, quantity=n)
+                                   for n in (1, 2, 3)
+                               ]
+                           })
+    assert response.status_code in (201, 409)
+
+    response = client.get("/api/v1/items",
+                          params={"filter": variant_filter})
+
+    assert response.status_code == 200
+    assert [item["title"] for item in response.json()] == ["Multi variant"]
+    assert response.headers["X-Total-Count"] == "1"
+
+
+@pytest.mark.parametrize("count", [True, False])
+def test_list_items_raises_on_unloaded_relationship(client, count):
+    """Relationships the list query doesn't load raise instead of loading"""
+    with Session(engine) as session:
+        items, _, _ = ItemService(session).get_items(ItemFilters(),
+                                                     count=count)
+        variant = next(item.variants[0] for item in items if item.variants)
+
+        # Loaded by the list query
+        assert variant.prices is not None
+        with pytest.raises(InvalidRequestError):
+            variant.order_links
+
+
+def test_update_item_replaces_variants(client):
+    """Updating an item keeps, adds and removes variants in one request"""
+    response = client.post("/api/v1/items",
+                           json={
+                               "title": "Updated",
+                               "variants": [{
+                                   "size": "S"
+                               }, {
+                                   "size": "L"
+                               }]
+                           })
+    assert response.status_code == 201
+    item = response.json()
+    small = next(v for v in item["variants"] if v["size"] == "S")
+
+    response = client.put(f"/api/v1/items/{item['id']}",
+                          json={"variants": [{
+                              "size": "S"
+                          }, {
+                              "size": "XL"
+                          }]})
+    assert response.status_code == 200
+
+    for body in (response.json(),
+                 client.get(f"/api/v1/items/{item['id']}").json()):
+        sizes = {v["size"]: v["id"] for v in body["variants"]}
+        assert sizes.keys() == {"S", "XL"}
+        # Resubmitted unchanged, so the stored variant is kept
+        assert sizes["S"] == small["id"]